@@ -1,105 +1,540 @@
+from array import array
 from collections import deque
-import heapq
+import math
 
 from constants import *
+from grid import INF, search_array
+from queues import QUEUES
 
 
-def BFS_init(cells, start, end, delta):
+def move_cost(dx, dy):
+    return COST_DIAGONAL if dx and dy else COST_STRAIGHT
+
+
+def path_cost(path):
+    '''
+    위치 리스트로 된 경로의 이동 비용 합
+    '''
+    return sum(move_cost(x2 - x1, y2 - y1) for (x1, y1), (x2, y2) in zip(path, path[1:]))
+
+
+# 휴리스틱: 목표까지 가로 / 세로 거리 차(절대값)를 받아 비용 추정
+# 정수로 내림한 값이 실제 비용보다 크지 않음(허용 가능), 단 manhattan 은 대각선 이동(14)을 20 으로 추정하므로
+# 상하좌우 이동에서만 허용 가능 (heuristic_func 에서 대각선 이동과 함께 고르면 ValueError)
+def manhattan(dx, dy):
+    return COST_STRAIGHT * (dx + dy)
+
+
+def octile(dx, dy):
+    return COST_STRAIGHT * (dx + dy) + (COST_DIAGONAL - 2 * COST_STRAIGHT) * min(dx, dy)
+
+
+EUCLIDEAN_SCALE = min(COST_STRAIGHT, COST_DIAGONAL / math.sqrt(2))  # 대각선 비용이 √2 배보다 작아도 허용 가능하도록
+
+
+def euclidean(dx, dy):
+    return int(EUCLIDEAN_SCALE * math.hypot(dx, dy))
+
+
+HEURISTICS = {'manhattan': manhattan, 'octile': octile, 'euclidean': euclidean}
+
+
+def heuristic_func(delta, heuristic=None):
+    '''
+    이름으로 휴리스틱 고르기, 없으면 이동 방식에 맞는 허용 가능한 휴리스틱
+    '''
+    if heuristic is None:
+        heuristic = 'octile' if len(delta) > 4 else 'manhattan'
+    elif heuristic == 'manhattan' and len(delta) > 4:
+        raise ValueError('manhattan heuristic overestimates diagonal moves')
+    return HEURISTICS[heuristic]
+
+
+def grid_moves(grid, delta, cost=move_cost):
+    '''
+    delta 의 방향마다 (dx, dy, 인덱스 차이, 이동 비용)
+    '''
+    return [(dx, dy, dy * grid.width + dx, cost(dx, dy)) for dx, dy in delta]
+
+
+def BFS_init(grid, start, end, delta):
+    grid.reset()
+    types, g, prev = grid.types, grid.g, grid.prev
+    width, height = grid.width, grid.height
+    moves = grid_moves(grid, delta)
+    g[start] = 0  # 이동 횟수
     BFS_queue = deque([start])
+    visited = search_array(grid.size, 0, 'B')  # 큐에 한 번 들어간 셀 (화면 색칠 없이도 중복 방문 방지)
+    visited[start] = 1
+    events = []  # 단계마다 (사건, 셀 인덱스, 방향) 기록
 
     def BFS():
-        height, width = len(cells), len(cells[0])
-        cell = BFS_queue.popleft()
-        x, y = cell.pos
+        events.clear()
+        idx = BFS_queue.popleft()
+        events.append((EVENT_POP, idx, 0))
+        x, y = idx % width, idx // width
 
-        for dx, dy in delta:
+        for dx, dy, offset, _ in moves:
             new_x = x + dx
             new_y = y + dy
 
             if -1 < new_x < width and -1 < new_y < height:
-                new_cell = cells[new_y][new_x]
-                if new_cell.color == COLOR_WHITE:
-                    BFS_queue.append(new_cell)
-                    new_cell.prev = cell
-                elif new_cell.color == COLOR_RED:
-                    new_cell.prev = cell
+                new_idx = idx + offset
+                if types[new_idx] == CELL_WALL or visited[new_idx]:
+                    continue
+                visited[new_idx] = 1
+                g[new_idx] = g[idx] + 1
+                prev[new_idx] = idx
+                if new_idx == end:
+                    events.append((EVENT_GOAL, new_idx, 0))
                     return 'complete'
+                BFS_queue.append(new_idx)
+                events.append((EVENT_PUSH, new_idx, 0))
 
         if not BFS_queue:
             return 'complete'
 
+    BFS.events = events
     return BFS_queue, BFS
 
 
-def Astar_init(cells, start, end, delta):
-    for column in cells:
-        for cell in column:
-            cell.g, cell.h, cell.f = 0, 0, 0  #  A* 알고리즘을 위한 g, h, f 값 초기화
-    Astar_heap = [(start.g, start)]
+def Astar_init(grid, start, end, delta, heuristic=None, queue='binary'):
+    h_func = heuristic_func(delta, heuristic)
+    grid.reset()  # A* 알고리즘을 위한 g, prev 값 초기화
+    types, g, prev = grid.types, grid.g, grid.prev
+    width, height = grid.width, grid.height
+    moves = grid_moves(grid, delta)
+    end_x, end_y = grid.pos(end)
+
+    def h(x, y):
+        return h_func(abs(x - end_x), abs(y - end_y))
+
+    g[start] = 0
+    start_h = h(*grid.pos(start))
+
+    # 열린 목록 (O(1) 포함 확인 / decrease-key), f 가 같으면 h 가 작은(목표에 가까운) 셀 우선
+    Astar_open = QUEUES[queue]()
+    Astar_open.push(start, start_h, start_h)
+    closed = search_array(grid.size, 0, 'B')  # 닫힌 목록
+    events = []
 
     def Astar():
-        height, width = len(cells), len(cells[0])
-        _, cell = heapq.heappop(Astar_heap)
-        x, y = cell.pos
+        events.clear()
+        _, idx = Astar_open.pop()
+        closed[idx] = 1
+        events.append((EVENT_POP, idx, 0))
+        if idx == end:
+            events.append((EVENT_GOAL, idx, 0))
+            return 'complete'
+        x, y = idx % width, idx // width
 
-        for dx, dy in delta:
+        for dx, dy, offset, cost in moves:
             new_x = x + dx
             new_y = y + dy
 
             if -1 < new_x < width and -1 < new_y < height:
-                new_cell = cells[new_y][new_x]
-                if new_cell.color == COLOR_WHITE:
-                    if all([(new_x, new_y) != other_cell.pos for _, other_cell in Astar_heap]):
-                        new_cell.g = cell.g + 1
-                        new_cell.h = (new_x - end.pos[0]) ** 2 + (new_y - end.pos[1]) ** 2  # euclidian
-                        new_cell.f = new_cell.g + new_cell.h
-                        heapq.heappush(Astar_heap, (new_cell.f, new_cell))
-                        new_cell.prev = cell
-                elif new_cell.color == COLOR_RED:
-                    new_cell.prev = cell
-                    return 'complete'
+                new_idx = idx + offset
+                if types[new_idx] == CELL_WALL or closed[new_idx]:
+                    continue
+                alt = g[idx] + cost
+                if alt < g[new_idx]:
+                    events.append((EVENT_RELAX if new_idx in Astar_open else EVENT_PUSH, new_idx, 0))
+                    g[new_idx] = alt
+                    prev[new_idx] = idx
+                    new_h = h(new_x, new_y)
+                    Astar_open.push(new_idx, alt + new_h, new_h)
 
-        if not Astar_heap:
+        if not Astar_open:
             return 'complete'
 
-    return Astar_heap, Astar
+    Astar.events = events
+    return Astar_open, Astar
 
 
-def dijkstra_init(cells, start, end, delta):
-    for column in cells:
-        for cell in column:
-            cell.dist = 0 if cell == start else float('inf')  # Dijkstra 알고리즘을 위한 dist 값 초기화
-            cell.prev = None                                  # Dijkstra 알고리즘을 위한 prev 값 초기화
-    dijkstra_heap = [(start.dist, start)]
+def dijkstra_init(grid, start, end, delta, queue='binary'):
+    grid.reset()  # Dijkstra 알고리즘을 위한 dist(g), prev 값 초기화
+    types, dist, prev = grid.types, grid.g, grid.prev
+    width, height = grid.width, grid.height
+    moves = grid_moves(grid, delta)
+    dist[start] = 0
+    dijkstra_queue = QUEUES[queue]()
+    dijkstra_queue.push(start, 0)
+    events = []
 
     def dijkstra():
-        height, width = len(cells), len(cells[0])
-        heapq.heapify(dijkstra_heap)
-        _, cell = heapq.heappop(dijkstra_heap)
-        x, y = cell.pos
+        events.clear()
+        _, idx = dijkstra_queue.pop()
+        events.append((EVENT_POP, idx, 0))
+
+        # 대각선 비용이 다르므로 끝점은 꺼낼 때 확정
+        if idx == end:
+            events.append((EVENT_GOAL, idx, 0))
+            return 'complete'
+        x, y = idx % width, idx // width
 
-        for dx, dy in delta:
+        for dx, dy, offset, cost in moves:
             new_x = x + dx
             new_y = y + dy
 
             if -1 < new_x < width and -1 < new_y < height:
-                new_cell = cells[new_y][new_x]
-                if new_cell.color == COLOR_WHITE:
-                    alt = cell.dist + 1
-                    if alt < new_cell.dist:
-                        new_cell.dist = alt
-                        new_cell.prev = cell
-                        heapq.heappush(dijkstra_heap, (new_cell.dist, new_cell))
-                elif new_cell.color == COLOR_RED:
-                    target = end
-                    target.prev = cell
-                    dijkstra.path = list()
-                    while target:
-                        dijkstra.path.append(target.pos)
-                        target = target.prev
-                    return 'complete'
+                new_idx = idx + offset
+                if types[new_idx] != CELL_WALL:
+                    alt = dist[idx] + cost
+                    if alt < dist[new_idx]:
+                        events.append((EVENT_RELAX if new_idx in dijkstra_queue else EVENT_PUSH, new_idx, 0))
+                        dist[new_idx] = alt
+                        prev[new_idx] = idx
+                        dijkstra_queue.push(new_idx, alt)
+
+        if not dijkstra_queue:
+            return 'complete'
+
+    dijkstra.events = events
+    return dijkstra_queue, dijkstra
+
+
+def bidirectional_init(grid, start, end, delta, moves, h_forward=None, h_backward=None, queue='binary'):
+    '''
+    시작점과 끝점에서 동시에 탐색해 가운데서 만나는 양방향 탐색 (BFS / 다익스트라 / A* 공통)
+    정방향은 g / prev, 역방향은 g_back / next 에 기록하고 완료되면 prev 로 경로를 이어 붙임
+    h_forward / h_backward 가 없으면 min key 합, 있으면 두 min f 중 큰 값이 최단 거리 후보 이상일 때 종료
+    '''
+    grid.reset(back=True)
+    types, width, height = grid.types, grid.width, grid.height
+    grid.g[start], grid.g_back[end] = 0, 0
+    sides = ((grid.g, grid.prev, grid.g_back, h_forward), (grid.g_back, grid.next, grid.g, h_backward))
+
+    def heuristic(h_func, idx):
+        return h_func(*grid.pos(idx)) if h_func else 0
+
+    forward_open, backward_open = QUEUES[queue](), QUEUES[queue]()
+    forward_open.push(start, heuristic(h_forward, start))
+    backward_open.push(end, heuristic(h_backward, end))
+    opens = (forward_open, backward_open)
+    closeds = (search_array(grid.size, 0, 'B'), search_array(grid.size, 0, 'B'))
+    best = [INF, -1]  # 지금까지 찾은 최단 거리와 만난 셀
+    events = []  # 방향은 정방향 0, 역방향 1
+
+    def bidirectional():
+        events.clear()
+
+        # 열린 목록이 작은 쪽을 한 칸 확장
+        side = 0 if len(forward_open) <= len(backward_open) else 1
+        open_list, closed = opens[side], closeds[side]
+        g, parent, other_g, h_func = sides[side]
+        _, idx = open_list.pop()
+        closed[idx] = 1
+        events.append((EVENT_POP, idx, side))
+        x, y = idx % width, idx // width
+
+        for dx, dy, offset, cost in moves:
+            new_x = x + dx
+            new_y = y + dy
+
+            if -1 < new_x < width and -1 < new_y < height:
+                new_idx = idx + offset
+                if types[new_idx] == CELL_WALL or closed[new_idx]:
+                    continue
+                alt = g[idx] + cost
+                if alt < g[new_idx]:
+                    events.append((EVENT_RELAX if new_idx in open_list else EVENT_PUSH, new_idx, side))
+                    g[new_idx] = alt
+                    parent[new_idx] = idx
+                    h = heuristic(h_func, new_idx)
+                    open_list.push(new_idx, alt + h, h)
+                    if alt + other_g[new_idx] < best[0]:
+                        best[:] = alt + other_g[new_idx], new_idx
+
+        # 종료 조건: 한 쪽이 끝났거나 남은 셀로는 더 짧은 경로를 만들 수 없을 때
+        if forward_open and backward_open:
+            forward_key, backward_key = forward_open.peek()[0], backward_open.peek()[0]
+            bound = max(forward_key, backward_key) if h_forward else forward_key + backward_key
+            if bound < best[0]:
+                return None
+
+        # 만난 셀에서 끝점까지 next 를 따라가며 prev 이어 붙이기
+        meet = best[1]
+        if meet >= 0:
+            events.append((EVENT_GOAL, meet, side))
+            grid.g[end] = best[0]
+            while meet != end:
+                grid.prev[grid.next[meet]] = meet
+                meet = grid.next[meet]
+        return 'complete'
+
+    bidirectional.events = events
+    return opens, bidirectional
+
 
-        if not dijkstra_heap:
+def biBFS_init(grid, start, end, delta):
+    moves = grid_moves(grid, delta, lambda dx, dy: 1)  # 이동 횟수 기준
+    return bidirectional_init(grid, start, end, delta, moves, queue='bucket')
+
+
+def biDijkstra_init(grid, start, end, delta, queue='binary'):
+    return bidirectional_init(grid, start, end, delta, grid_moves(grid, delta), queue=queue)
+
+
+def biAstar_init(grid, start, end, delta, heuristic=None, queue='binary'):
+    h_func = heuristic_func(delta, heuristic)
+    (start_x, start_y), (end_x, end_y) = grid.pos(start), grid.pos(end)
+    h_forward = lambda x, y: h_func(abs(x - end_x), abs(y - end_y))
+    h_backward = lambda x, y: h_func(abs(x - start_x), abs(y - start_y))
+    return bidirectional_init(grid, start, end, delta, grid_moves(grid, delta), h_forward, h_backward, queue)
+
+
+def sign(value):
+    return (value > 0) - (value < 0)
+
+
+def walkable_func(grid):
+    types, width, height = grid.types, grid.width, grid.height
+
+    def walkable(x, y):
+        return -1 < x < width and -1 < y < height and types[y * width + x] != CELL_WALL
+
+    return walkable
+
+
+def is_forced(walkable, x, y, dx, dy, diagonal):
+    '''
+    (dx, dy) 방향으로 들어온 셀 (x, y) 에 강제 이웃이 있는지 확인
+    '''
+    if diagonal:
+        if dx and dy:
+            return (walkable(x - dx, y + dy) and not walkable(x - dx, y)) or (walkable(x + dx, y - dy) and not walkable(x, y - dy))
+        if dx:
+            return (walkable(x + dx, y + 1) and not walkable(x, y + 1)) or (walkable(x + dx, y - 1) and not walkable(x, y - 1))
+        return (walkable(x + 1, y + dy) and not walkable(x + 1, y)) or (walkable(x - 1, y + dy) and not walkable(x - 1, y))
+    if dx:
+        return (walkable(x, y - 1) and not walkable(x - dx, y - 1)) or (walkable(x, y + 1) and not walkable(x - dx, y + 1))
+    return (walkable(x - 1, y) and not walkable(x - 1, y - dy)) or (walkable(x + 1, y) and not walkable(x + 1, y - dy))
+
+
+def sub_directions(dx, dy, diagonal):
+    '''
+    (dx, dy) 방향으로 점프하는 동안 매 칸마다 직선 점프로 확인할 방향
+    (대각선 이동, 4방향 탐색에서는 세로 이동)
+    '''
+    if diagonal:
+        return ((dx, 0), (0, dy)) if dx and dy else ()
+    return ((1, 0), (-1, 0)) if dy else ()
+
+
+def pruned_directions(walkable, x, y, dx, dy, diagonal):
+    '''
+    (dx, dy) 방향으로 도착한 점프 포인트 (x, y) 에서 계속 탐색할 방향 (자연 이웃 + 강제 이웃)
+    '''
+    if not diagonal:
+        return ((0, -1), (0, 1), (dx, 0)) if dx else ((-1, 0), (1, 0), (0, dy))
+
+    if dx and dy:
+        directions = [(0, dy), (dx, 0), (dx, dy)]
+        if not walkable(x - dx, y):
+            directions.append((-dx, dy))
+        if not walkable(x, y - dy):
+            directions.append((dx, -dy))
+    elif dx:
+        directions = [(dx, 0)]
+        if not walkable(x, y + 1):
+            directions.append((dx, 1))
+        if not walkable(x, y - 1):
+            directions.append((dx, -1))
+    else:
+        directions = [(0, dy)]
+        if not walkable(x + 1, y):
+            directions.append((1, dy))
+        if not walkable(x - 1, y):
+            directions.append((-1, dy))
+    return directions
+
+
+def fill_path(grid, end):
+    '''
+    점프 포인트로만 이어진 prev 를 사이 셀들까지 한 칸씩 이어지도록 채우기
+    '''
+    prev = grid.prev
+    idx = end
+    while prev[idx] >= 0:
+        jump_point = prev[idx]
+        (x, y), (prev_x, prev_y) = grid.pos(idx), grid.pos(jump_point)
+        dx, dy = sign(x - prev_x), sign(y - prev_y)
+        while (x - dx, y - dy) != (prev_x, prev_y):
+            x, y = x - dx, y - dy
+            prev[idx] = grid.index(x, y)
+            idx = prev[idx]
+        prev[idx] = jump_point
+        idx = jump_point
+
+
+def trace_path(grid, cells):
+    '''
+    셀 인덱스 리스트로 된 경로만 prev / g 에 기록 (탐색 없이 찾아둔 경로를 보드에 보여줄 때)
+    '''
+    grid.reset()
+    if not cells:
+        return
+    grid.g[cells[0]] = 0
+    for prev, idx in zip(cells, cells[1:]):
+        (x, y), (prev_x, prev_y) = grid.pos(idx), grid.pos(prev)
+        grid.prev[idx] = prev
+        grid.g[idx] = grid.g[prev] + move_cost(x - prev_x, y - prev_y)
+
+
+def jump_search_init(grid, start, end, delta, jump, heuristic=None, queue='binary'):
+    '''
+    점프 포인트만 열린 목록에 넣는 A* (JPS / JPS+ 공통)
+    jump(x, y, dx, dy) 는 (x, y) 에서 (dx, dy) 방향으로 처음 만나는 점프 포인트 인덱스 또는 -1
+    '''
+    diagonal = len(delta) > 4
+    h_func = heuristic_func(delta, heuristic)
+    walkable = walkable_func(grid)
+    grid.reset()
+    g, prev, width = grid.g, grid.prev, grid.width
+    end_x, end_y = grid.pos(end)
+
+    def h(x, y):
+        return h_func(abs(x - end_x), abs(y - end_y))
+
+    g[start] = 0
+    start_h = h(*grid.pos(start))
+    JPS_open = QUEUES[queue]()
+    JPS_open.push(start, start_h, start_h)
+    closed = search_array(grid.size, 0, 'B')
+    events = []
+
+    def JPS():
+        events.clear()
+        _, idx = JPS_open.pop()
+        closed[idx] = 1
+        events.append((EVENT_POP, idx, 0))
+        if idx == end:
+            events.append((EVENT_GOAL, idx, 0))
+            fill_path(grid, end)
             return 'complete'
+        x, y = idx % width, idx // width
+
+        # 시작점은 모든 방향, 나머지는 들어온 방향 기준으로 가지치기
+        if prev[idx] < 0:
+            directions = delta
+        else:
+            prev_x, prev_y = grid.pos(prev[idx])
+            directions = pruned_directions(walkable, x, y, sign(x - prev_x), sign(y - prev_y), diagonal)
+
+        for dx, dy in directions:
+            jump_idx = jump(x, y, dx, dy)
+            if jump_idx < 0 or closed[jump_idx]:
+                continue
+            jump_x, jump_y = jump_idx % width, jump_idx // width
+            alt = g[idx] + move_cost(dx, dy) * max(abs(jump_x - x), abs(jump_y - y))
+            if alt < g[jump_idx]:
+                events.append((EVENT_RELAX if jump_idx in JPS_open else EVENT_PUSH, jump_idx, 0))
+                g[jump_idx] = alt
+                prev[jump_idx] = idx
+                jump_h = h(jump_x, jump_y)
+                JPS_open.push(jump_idx, alt + jump_h, jump_h)
+
+        if not JPS_open:
+            return 'complete'
+
+    JPS.events = events
+    return JPS_open, JPS
+
+
+def JPS_init(grid, start, end, delta, heuristic=None, queue='binary'):
+    diagonal = len(delta) > 4
+    walkable = walkable_func(grid)
+    end_x, end_y = grid.pos(end)
+
+    def jump(x, y, dx, dy):
+        sub = sub_directions(dx, dy, diagonal)
+        while True:
+            x, y = x + dx, y + dy
+            if not walkable(x, y):
+                return -1
+            if (x == end_x and y == end_y) or is_forced(walkable, x, y, dx, dy, diagonal):
+                return grid.index(x, y)
+            if any(jump(x, y, sub_x, sub_y) >= 0 for sub_x, sub_y in sub):
+                return grid.index(x, y)
+
+    return jump_search_init(grid, start, end, delta, jump, heuristic, queue)
+
+
+def build_jump_table(grid, delta):
+    '''
+    JPS+ 전처리: 셀마다 delta 의 각 방향으로 다음 점프 포인트까지의 칸 수(양수)
+    또는 점프 포인트 없이 벽 / 경계까지 갈 수 있는 칸 수(0 이하의 음수)를 저장
+    table[(y * width + x) * len(delta) + 방향 인덱스]
+    '''
+    diagonal = len(delta) > 4
+    walkable = walkable_func(grid)
+    height, width, stride = grid.height, grid.width, len(delta)
+    index = {direction: d for d, direction in enumerate(delta)}
+    table = array('i', [0]) * (width * height * stride)
+
+    # 보조 방향(직선) 값을 먼저 채워야 대각선 / 세로 방향 계산에 쓸 수 있음
+    for d in sorted(range(stride), key=lambda d: len(sub_directions(*delta[d], diagonal))):
+        dx, dy = delta[d]
+        sub = [index[direction] for direction in sub_directions(dx, dy, diagonal)]
+        ys = range(height - 1, -1, -1) if dy > 0 else range(height)
+        xs = range(width - 1, -1, -1) if dx > 0 else range(width)
+        for y in ys:
+            for x in xs:
+                next_x, next_y = x + dx, y + dy
+                if not walkable(next_x, next_y):
+                    value = 0
+                else:
+                    next_idx = (next_y * width + next_x) * stride
+                    if is_forced(walkable, next_x, next_y, dx, dy, diagonal) or any(table[next_idx + s] > 0 for s in sub):
+                        value = 1
+                    else:
+                        value = table[next_idx + d]
+                        value = value + 1 if value > 0 else value - 1
+                table[(y * width + x) * stride + d] = value
+    return table
+
+
+def JPSplus_init(grid, start, end, delta, heuristic=None, queue='binary', jump_table=None):
+    diagonal = len(delta) > 4
+    table = build_jump_table(grid, delta) if jump_table is None else jump_table
+    width, stride = grid.width, len(delta)
+    index = {direction: d for d, direction in enumerate(delta)}
+    end_x, end_y = grid.pos(end)
+
+    def goal_steps(x, y, dx, dy):
+        # 끝점이 (x, y) 에서 (dx, dy) 방향 직선 위에 있으면 몇 칸 떨어졌는지
+        goal_dx, goal_dy = end_x - x, end_y - y
+        steps = goal_dx * dx if dx else goal_dy * dy
+        if steps >= 0 and goal_dx == steps * dx and goal_dy == steps * dy:
+            return steps
+        return None
+
+    def jump(x, y, dx, dy):
+        value = table[(y * width + x) * stride + index[dx, dy]]
+        limit = abs(value)  # 점프 포인트 또는 벽까지 칸 수
+        sub = sub_directions(dx, dy, diagonal)
+
+        # 직선: 점프 포인트보다 끝점이 가까우면 끝점
+        if not sub:
+            steps = goal_steps(x, y, dx, dy)
+            if steps and steps <= limit:
+                return end
+            return (y + value * dy) * width + x + value * dx if value > 0 else -1
+
+        # 대각선 / 세로: 끝점과 같은 행이나 열이 되는 칸에서 보조 방향 직선 점프가 끝점에 닿는지 확인
+        best = value if value > 0 else None
+        candidates = [(end_y - y) * dy]
+        if dx:
+            candidates.append((end_x - x) * dx)
+        for steps in candidates:
+            if 0 < steps <= limit and (best is None or steps < best):
+                cell_x, cell_y = x + steps * dx, y + steps * dy
+                cell_idx = (cell_y * width + cell_x) * stride
+                for sub_x, sub_y in sub:
+                    sub_steps = goal_steps(cell_x, cell_y, sub_x, sub_y)
+                    if sub_steps is not None and sub_steps <= abs(table[cell_idx + index[sub_x, sub_y]]):
+                        best = steps
+                        break
+        return (y + best * dy) * width + x + best * dx if best else -1
 
-    return dijkstra_heap, dijkstra
+    return jump_search_init(grid, start, end, delta, jump, heuristic, queue)
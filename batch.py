@@ -0,0 +1,193 @@
+'''
+지도 하나에 대한 많은 (시작점, 끝점) 질의를 여러 프로세스로 나눠 실행
+
+지도는 작업자마다 한 번만 받고(fork 면 복사 없이 상속, 아니면 셀 종류 bytes 로 받아 다시 만듦), 질의는 묶음 단위로 나눠 보낸 뒤
+결과를 질의 순서대로 흘려보냄 (동시에 처리 중인 묶음 수를 제한해 메모리 일정)
+
+    python3 batch.py arena.map arena.map.scen -a A* -d -j 8 -o result.csv
+    python3 batch.py map.txt queries.txt    # 질의 파일 한 줄: 시작 x 시작 y 끝 x 끝 y
+'''
+import argparse
+from collections import OrderedDict, deque
+import csv
+import itertools
+import multiprocessing
+import os
+import sys
+
+import algorithms
+import bench
+import engine
+import hpa
+from constants import *
+from grid import Grid, is_grid_file, open_grid
+from queues import QUEUES
+
+# 작업자 프로세스의 보드 / 탐색 설정 (init_worker 에서 한 번 설정)
+worker = {}
+
+
+def load_board(path):
+    '''
+    .grid 파일, Moving AI 지도(type 머리말) 또는 텍스트 지도 파일로 보드 만들기
+    '''
+    if is_grid_file(path):
+        return open_grid(path)
+    with open(path) as f:
+        moving_ai = f.readline().startswith('type')
+    return engine.as_grid(bench.load_moving_ai_map(path) if moving_ai else engine.load_map(path))
+
+
+def read_queries(lines):
+    '''
+    질의 줄들을 읽으며 (시작점, 끝점) 을 하나씩 생성 (Moving AI 시나리오 또는 x y x y 네 숫자)
+    '''
+    for line in lines:
+        fields = line.split()
+        if len(fields) >= 9:
+            fields = fields[4:8]
+        elif len(fields) != 4:  # version 줄 / 빈 줄
+            continue
+        start_x, start_y, goal_x, goal_y = map(int, fields)
+        yield (start_x, start_y), (goal_x, goal_y)
+
+
+def init_worker(board, algorithm, delta, connectivity, options):
+    worker.update(board=board, algorithm=algorithm, init_func=engine.ALGORITHMS[algorithm], delta=delta,
+                  connectivity=connectivity, options=options, fields=OrderedDict())
+
+
+def init_spawned_worker(width, height, types, algorithm, diagonal, labels, parent, options):
+    '''
+    fork 가 없을 때의 작업자 초기화: 피클할 수 없는 메모리 매핑 보드 / 연결 요소 인덱스(walkable 클로저) /
+    HPA* 추상 그래프 대신 받은 셀 종류와 연결 요소 번호로 다시 만듦
+    '''
+    board = Grid(width, height, bytearray(types))
+    delta = WITH_DIAGONAL if diagonal else WITHOUT_DIAGONAL
+    connectivity = engine.build_connectivity(board, diagonal)
+    connectivity.labels, connectivity.parent = labels, parent  # 부모 프로세스에서 매긴 번호
+    if algorithm == 'HPA*':
+        options['hierarchy'] = hpa.Hierarchy(board, delta)
+    init_worker(board, algorithm, delta, connectivity, options)
+
+
+def flow_field(board, goal):
+    '''
+    끝점의 흐름장 (작업자마다 최근에 쓴 FIELD_CACHE_SIZE 개를 남겨두고 같은 끝점 질의에 다시 씀)
+    '''
+    fields, delta = worker['fields'], worker['delta']
+    goal = board.index(*goal)
+    field = fields.get(goal)
+    if field is None or not field.matches(board, goal, delta):
+        field = fields[goal] = engine.field.FlowField(board, goal, delta)
+    fields.move_to_end(goal)
+    while len(fields) > FIELD_CACHE_SIZE:
+        fields.popitem(last=False)
+    return field
+
+
+def run_chunk(queries):
+    '''
+    작업자에서 질의 묶음 실행, 질의마다 (비용, 확장 수, 경로 길이) 리스트 반환
+    '''
+    board, connectivity = worker['board'], worker['connectivity']
+    results = []
+    for start, goal in queries:
+        if start != goal and not connectivity.connected(start, goal):
+            results.append((None, 0, 0))
+            continue
+        options = worker['options']
+        if worker['algorithm'] == 'Flow field':
+            options = dict(options, field=flow_field(board, goal))
+        result = engine.search(board, start, goal, worker['init_func'], worker['delta'], **options)
+        results.append((result.cost, result.expansions, len(result.path)))
+    return results
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(board, queries, algorithm=DEFAULT_MODE, diagonal=False, workers=None, chunk_size=64, **options):
+    '''
+    queries((시작점, 끝점) 반복자) 를 workers 개 프로세스에서 실행하고
+    (시작점, 끝점, 비용, 확장 수, 경로 길이) 를 질의 순서대로 생성
+    처리 중인 묶음은 작업자 수의 4 배까지만 두므로 질의가 아무리 많아도 메모리는 일정
+    '''
+    delta = WITH_DIAGONAL if diagonal else WITHOUT_DIAGONAL
+    connectivity = engine.build_connectivity(board, diagonal)
+    connectivity.build()  # 작업자마다 다시 매기지 않게 미리 번호 매기기
+    if algorithm == 'JPS+' and 'jump_table' not in options:  # 점프 테이블도 지도처럼 한 번만 계산
+        options['jump_table'] = algorithms.build_jump_table(board, delta)
+    if algorithm == 'HPA*' and 'hierarchy' not in options:
+        options['hierarchy'] = hpa.Hierarchy(board, delta)
+    options = engine.init_options(algorithm, options, delta)
+    initargs = board, algorithm, delta, connectivity, options
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:  # 프로세스 없이 바로 실행
+        init_worker(*initargs)
+        for chunk in chunked(queries, chunk_size):
+            for (start, goal), result in zip(chunk, run_chunk(chunk)):
+                yield (start, goal) + result
+        return
+
+    # fork 가 되면 보드를 복사 없이 물려받고, 아니면 피클할 수 있는 상태만 작업자마다 한 번 전달
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context, initializer = multiprocessing.get_context('fork'), init_worker
+    else:
+        context, initializer = multiprocessing.get_context(), init_spawned_worker
+        options = {name: value for name, value in options.items() if name != 'hierarchy'}
+        initargs = (board.width, board.height, bytes(board.types), algorithm, diagonal,
+                    connectivity.labels, connectivity.parent, options)
+    with context.Pool(workers, initializer, initargs) as pool:
+        pending = deque()
+        for chunk in chunked(queries, chunk_size):
+            pending.append((chunk, pool.apply_async(run_chunk, (chunk,))))
+            while len(pending) >= 4 * workers:
+                yield from finished(*pending.popleft())
+        while pending:
+            yield from finished(*pending.popleft())
+
+
+def finished(chunk, async_result):
+    for (start, goal), result in zip(chunk, async_result.get()):
+        yield (start, goal) + result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Batch pathfinding queries')
+    parser.add_argument('map', help='지도 파일 (.grid, Moving AI .map 또는 텍스트 지도)')
+    parser.add_argument('queries', help='질의 파일 (Moving AI .scen 또는 한 줄에 x y x y), - 는 표준 입력')
+    parser.add_argument('-a', '--algorithm', default=DEFAULT_MODE, choices=list(engine.ALGORITHMS))
+    parser.add_argument('-d', '--diagonal', action='store_true', help='대각선 이동 허용')
+    parser.add_argument('--queue', choices=list(QUEUES), help='다익스트라 / A* 열린 목록 구현 (기본: binary)')
+    parser.add_argument('-j', '--workers', type=int, help='작업자 프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--chunk', type=int, default=64, help='한 번에 작업자에게 보낼 질의 수')
+    parser.add_argument('-o', '--output', help='결과 CSV 파일 (기본: 표준 출력)')
+    args = parser.parse_args(argv)
+
+    options = {'queue': args.queue} if args.queue else {}
+    board = load_board(args.map)
+    source = sys.stdin if args.queries == '-' else open(args.queries)
+    output = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        writer = csv.writer(output)
+        writer.writerow(['start', 'goal', 'cost', 'expansions', 'length'])
+        results = run_batch(board, read_queries(source), args.algorithm, args.diagonal, args.workers, args.chunk, **options)
+        for (start_x, start_y), (goal_x, goal_y), cost, expansions, length in results:
+            writer.writerow(['{},{}'.format(start_x, start_y), '{},{}'.format(goal_x, goal_y), cost, expansions, length])
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+'''
+길찾기 알고리즘 벤치마크
+
+Moving AI 지도(.map) / 시나리오(.scen) 와 생성한 지도(무작위 장애물, 미로, 방) 위에서
+모든 알고리즘을 헤드리스로 실행하고 측정값을 JSON / CSV 로 출력
+
+    python3 bench.py --generate maze random rooms --sizes 64 128 -d --format csv -o result.csv
+    python3 bench.py --scen maps/arena.map.scen --limit 100 -a A* JPS
+
+열린 목록 구현별 비교 표
+
+    python3 bench.py --queues --sizes 64 128 256 --repeat 3 -d
+'''
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from algorithms import build_jump_table
+import engine
+import hpa
+from constants import *
+from instrument import open_size
+from queues import QUEUES
+
+# 측정값 한 줄의 항목 (CSV 열 순서)
+FIELDS = ['map', 'width', 'height', 'algorithm', 'start', 'goal', 'time_ms', 'expansions', 'pushes',
+          'peak_open', 'cost', 'optimal', 'cost_ratio', 'peak_memory_kb']
+
+
+def random_grid(size, density, seed):
+    '''
+    size x size 지도에 density 비율로 벽을 무작위 배치 (시작점 / 끝점 모서리는 비움)
+    '''
+    rng = random.Random(seed)
+    grid = [[int(rng.random() < density) for _ in range(size)] for _ in range(size)]
+    grid[0][0] = grid[size - 1][size - 1] = 0
+    return grid
+
+
+def maze_grid(size, seed):
+    '''
+    size x size 미로 (짝수 좌표가 통로, 깊이 우선 탐색으로 벽을 허물어 만든 완전 미로)
+    '''
+    rng = random.Random(seed)
+    grid = [[1] * size for _ in range(size)]
+    grid[0][0] = 0
+    stack = [(0, 0)]
+    while stack:
+        x, y = stack[-1]
+        neighbors = [(x + dx, y + dy) for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+                     if -1 < x + dx < size and -1 < y + dy < size and grid[y + dy][x + dx]]
+        if not neighbors:
+            stack.pop()
+            continue
+        new_x, new_y = rng.choice(neighbors)
+        grid[(y + new_y) // 2][(x + new_x) // 2] = grid[new_y][new_x] = 0
+        stack.append((new_x, new_y))
+    return grid
+
+
+def room_grid(size, seed, room=8):
+    '''
+    size x size 지도를 room 칸 간격의 벽으로 나누고 방 한 변마다 문을 하나씩 낸 방 지도
+    '''
+    rng = random.Random(seed)
+    grid = [[0] * size for _ in range(size)]
+    for wall in range(room, size, room):
+        for start in range(0, size, room):
+            cells = range(start, min(start + room, size))
+            doors = [pos for pos in cells if pos % room]  # 벽이 만나는 칸은 문에서 제외
+            door = rng.choice(doors) if doors else None
+            for pos in cells:
+                if pos != door:
+                    grid[wall][pos] = grid[pos][wall] = 1
+    return grid
+
+
+# 생성할 지도 종류 - 생성 함수(크기, 시드)
+GENERATORS = {
+    'random': lambda size, seed: random_grid(size, 0.2, seed),
+    'maze': maze_grid,
+    'rooms': room_grid,
+}
+
+
+def load_moving_ai_map(path):
+    '''
+    Moving AI 지도 파일 읽기 (type / height / width 머리말과 map 줄 뒤에 한 줄이 한 행)
+    '''
+    with open(path) as f:
+        lines = f.read().splitlines()
+    header = {}
+    for num, line in enumerate(lines):
+        if line.strip() == 'map':
+            break
+        key, value = line.split()
+        header[key] = value
+    height, width = int(header['height']), int(header['width'])
+    rows = [line[:width] for line in lines[num + 1:num + 1 + height]]
+    if len(rows) != height or any(len(row) != width for row in rows):
+        raise ValueError('{}: map size does not match header {}x{}'.format(path, width, height))
+    return rows
+
+
+def load_scenarios(path):
+    '''
+    Moving AI 시나리오 파일 읽기, (지도 이름, 시작점, 끝점, 기록된 최단 거리) 리스트 반환
+    (기록된 거리는 모서리 통과 금지 / 대각선 √2 기준이라 이 프로젝트의 비용과는 다름)
+    '''
+    scenarios = []
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) < 9:  # version 줄
+                continue
+            start_x, start_y, goal_x, goal_y = map(int, fields[4:8])
+            scenarios.append((fields[1], (start_x, start_y), (goal_x, goal_y), float(fields[8])))
+    return scenarios
+
+
+def scenario_map_path(scen_path, map_name, map_paths):
+    '''
+    시나리오가 가리키는 지도 파일 찾기 (--maps 로 준 파일, 시나리오 옆, 시나리오 옆 maps 폴더 순)
+    '''
+    for path in map_paths:
+        if os.path.basename(path) == os.path.basename(map_name):
+            return path
+    directory = os.path.dirname(scen_path)
+    for path in (os.path.join(directory, map_name), os.path.join(directory, 'maps', os.path.basename(map_name))):
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError('map {} for {} not found'.format(map_name, scen_path))
+
+
+def corner_query(rows):
+    '''
+    시나리오 없는 지도의 질의: 행 우선으로 첫 번째 빈 칸에서 마지막 빈 칸까지
+    '''
+    cells = [(x, y) for y, row in enumerate(rows) for x, value in enumerate(row) if not engine.is_wall(value)]
+    return cells[0], cells[-1]
+
+
+def measure(board, start, goal, algorithm, delta, repeat=1, **options):
+    '''
+    질의 하나의 측정값: 측정 코드 없이 repeat 번 실행한 최소 시간과,
+    한 번 더 실행하며 센 확장 수 / 열린 목록에 넣은 횟수 / 열린 목록 최대 크기 / 최대 메모리
+    '''
+    init_func = engine.ALGORITHMS[algorithm]
+    times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        engine.search(board, start, goal, init_func, delta, **options)
+        times.append(time.perf_counter() - start_time)
+
+    counts = {'pushes': None, 'peak_open': 0}
+
+    def observer(data, func):
+        size = open_size(data)
+        if counts['pushes'] is None:  # 시작 전: 처음 넣은 셀
+            counts['pushes'] = size
+        counts['pushes'] += sum(1 for event, _, _ in func.events if event in (EVENT_PUSH, EVENT_RELAX))
+        counts['peak_open'] = max(counts['peak_open'], size)
+
+    tracemalloc.start()
+    result = engine.search(board, start, goal, init_func, delta, observer, **options)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'algorithm': algorithm,
+        'start': '{},{}'.format(*start),
+        'goal': '{},{}'.format(*goal),
+        'time_ms': round(min(times) * 1000, 3),
+        'expansions': result.expansions,
+        'pushes': counts['pushes'] or 0,
+        'peak_open': counts['peak_open'],
+        'cost': result.cost,
+        'peak_memory_kb': round(peak_memory / 1024, 1),
+    }
+
+
+def bench_map(name, rows, queries, algorithms, diagonal, repeat=1, **options):
+    '''
+    지도 하나의 질의마다 알고리즘별로 측정해 측정값 dict 를 차례로 생성
+    최적 비용은 다익스트라로 구해 cost_ratio (비용 / 최적) 계산에 사용
+    '''
+    delta = WITH_DIAGONAL if diagonal else WITHOUT_DIAGONAL
+    board = engine.as_grid(rows)  # 보드 생성은 측정에서 제외
+    hierarchy = hpa.Hierarchy(board, delta) if 'HPA*' in algorithms else None  # HPA* 추상 그래프도 지도마다 한 번만
+    jump_table = build_jump_table(board, delta) if 'JPS+' in algorithms else None  # JPS+ 점프 테이블도
+    for start, goal in queries:
+        optimal = engine.search(board, start, goal, engine.ALGORITHMS['Dijkstra'], delta).cost
+        for algorithm in algorithms:
+            algorithm_options = engine.init_options(algorithm, options, delta)  # 열린 목록을 고를 수 없는 알고리즘은 빼고
+            if algorithm == 'HPA*':
+                algorithm_options['hierarchy'] = hierarchy
+            elif algorithm == 'JPS+':
+                algorithm_options['jump_table'] = jump_table
+            record = measure(board, start, goal, algorithm, delta, repeat, **algorithm_options)
+            record.update(map=name, width=board.width, height=board.height, optimal=optimal)
+            record['cost_ratio'] = round(record['cost'] / optimal, 4) if record['cost'] and optimal else None
+            yield {field: record[field] for field in FIELDS}
+
+
+def bench_suite(args):
+    '''
+    명령행 인자로 고른 생성 지도 / 지도 파일 / 시나리오 전체 측정
+    '''
+    algorithms = args.algorithms or list(engine.ALGORITHMS)
+    options = {'queue': args.queue} if args.queue else {}
+
+    for generator in args.generate:
+        for size in args.sizes:
+            rows = GENERATORS[generator](size, args.seed)
+            name = '{}-{}'.format(generator, size)
+            yield from bench_map(name, rows, [corner_query(rows)], algorithms, args.diagonal, args.repeat, **options)
+
+    for path in [] if args.scen else args.maps:  # 시나리오가 있으면 지도 파일은 시나리오용
+        rows = load_moving_ai_map(path)
+        yield from bench_map(os.path.basename(path), rows, [corner_query(rows)], algorithms, args.diagonal, args.repeat, **options)
+
+    for scen_path in args.scen:
+        scenarios = load_scenarios(scen_path)[:args.limit]
+        for map_name in sorted({scenario[0] for scenario in scenarios}):
+            rows = load_moving_ai_map(scenario_map_path(scen_path, map_name, args.maps))
+            queries = [(start, goal) for name, start, goal, _ in scenarios if name == map_name]
+            yield from bench_map(os.path.basename(map_name), rows, queries, algorithms, args.diagonal, args.repeat, **options)
+
+
+def write_records(records, output, output_format):
+    '''
+    측정값을 JSON 배열 또는 CSV 로 쓰기
+    '''
+    if output_format == 'json':
+        json.dump(list(records), output, indent=1)
+        output.write('\n')
+        return
+    writer = csv.DictWriter(output, FIELDS)
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+
+
+def bench_queues(sizes, density, repeat, diagonal, seed=0):
+    '''
+    같은 지도 위에서 구현별로 탐색 시간 측정, (크기, 알고리즘, 큐, 비용, 확장 수, 최소 시간) 리스트 반환
+    '''
+    delta = engine.WITH_DIAGONAL if diagonal else engine.WITHOUT_DIAGONAL
+    rows = []
+    for size in sizes:
+        grid = random_grid(size, density, seed)
+        for algorithm in ('Dijkstra', 'A*'):
+            for queue in QUEUES:
+                times = []
+                for _ in range(repeat):
+                    board = engine.as_grid(grid)  # 보드 생성은 측정에서 제외
+                    start_time = time.perf_counter()
+                    result = engine.search(board, (0, 0), (size - 1, size - 1), engine.ALGORITHMS[algorithm], delta, queue=queue)
+                    times.append(time.perf_counter() - start_time)
+                rows.append((size, algorithm, queue, result.cost, result.expansions, min(times)))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pathfinding benchmark')
+    parser.add_argument('--maps', nargs='+', default=[], help='Moving AI 지도 파일 (.map)')
+    parser.add_argument('--scen', nargs='+', default=[], help='Moving AI 시나리오 파일 (.scen)')
+    parser.add_argument('--limit', type=int, help='시나리오 파일마다 실행할 질의 수')
+    parser.add_argument('--generate', nargs='*', choices=list(GENERATORS), help='생성할 지도 (기본: 지도 파일이 없으면 전부)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[64, 128, 256])
+    parser.add_argument('-a', '--algorithms', nargs='+', choices=list(engine.ALGORITHMS), help='측정할 알고리즘 (기본: 전부)')
+    parser.add_argument('--queue', choices=list(QUEUES), help='다익스트라 / A* 열린 목록 구현 (기본: binary)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-d', '--diagonal', action='store_true', help='대각선 이동 허용')
+    parser.add_argument('--format', choices=['json', 'csv'], default='json')
+    parser.add_argument('-o', '--output', help='결과 파일 (기본: 표준 출력)')
+    parser.add_argument('--queues', action='store_true', help='열린 목록 구현별 비교 표 출력')
+    parser.add_argument('--density', type=float, default=0.2, help='--queues 지도의 벽 비율')
+    args = parser.parse_args(argv)
+
+    if args.queues:
+        print('{:>6} {:>9} {:>7} {:>8} {:>10} {:>10}'.format('size', 'algorithm', 'queue', 'cost', 'expanded', 'time(ms)'))
+        for size, algorithm, queue, cost, expansions, seconds in bench_queues(args.sizes, args.density, args.repeat, args.diagonal, args.seed):
+            print('{:>6} {:>9} {:>7} {:>8} {:>10} {:>10.2f}'.format(size, algorithm, queue, str(cost), expansions, seconds * 1000))
+        return
+
+    if args.generate is None:
+        args.generate = [] if args.maps or args.scen else list(GENERATORS)
+    if args.output:
+        with open(args.output, 'w', newline='') as output:
+            write_records(bench_suite(args), output, args.format)
+    else:
+        write_records(bench_suite(args), sys.stdout, args.format)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+'''
+같은 보드에 반복되는 (시작점, 끝점) 질의의 결과를 저장해두고 탐색 없이 답하는 캐시
+
+결과는 최근에 쓴 순서로 QUERY_CACHE_SIZE 개까지 두고, 다익스트라 / BFS 는 출발점에서 뻗은
+탐색 트리(g / prev)도 TREE_CACHE_SIZE 개까지 둬서 트리 안에서 확정된 끝점은 새 질의도 바로 답함
+벽을 고치면 update(x, y) 로 그 셀의 영향을 받는 결과 / 트리만 버림
+
+    cache = QueryCache(grid)
+    result = cache.search((0, 0), (29, 29), 'Dijkstra', WITH_DIAGONAL)
+    grid.types[idx] = CELL_WALL
+    cache.update(x, y)
+'''
+import copy
+from collections import OrderedDict
+
+import algorithms
+import engine
+from constants import *
+from grid import INF
+
+# 출발점에서 뻗은 탐색 트리를 재사용할 수 있는 모드 (끝점 방향으로 치우치지 않은 탐색)
+TREE_MODES = ('BFS', 'Dijkstra')
+
+
+class Tree(object):
+    '''
+    출발점 하나에서 탐색한 g / prev 의 사본
+    radius 보다 g 가 작은 셀은 확정된 값, exhaustive 면 닿지 않은 셀은 이어지지 않은 셀
+    '''
+    __slots__ = ('g', 'prev', 'end', 'radius', 'exhaustive')
+
+    def __init__(self, grid, mode, end, found):
+        self.g = copy.copy(grid.g)  # 배열 또는 닿은 셀만 저장한 dict
+        self.prev = copy.copy(grid.prev)
+        self.end = end
+        # 다익스트라는 끝점보다 가까운 셀만 확정, BFS 는 큐에 넣을 때 이동 횟수가 확정
+        self.radius = grid.g[end] if found and mode == 'Dijkstra' else INF
+        self.exhaustive = not found  # 끝점을 못 찾았으면 닿을 수 있는 셀을 모두 확장함
+
+    def settled(self, idx):
+        # 끝점은 radius 와 g 가 같아서 따로 확인 (찾지 못했으면 g 가 INF 라 확정 아님)
+        return self.g[idx] < self.radius or (idx == self.end and self.g[idx] < INF)
+
+    def path(self, grid, end):
+        '''
+        트리에서 end 까지의 위치 리스트 (확정되지 않은 끝점은 None)
+        '''
+        if self.settled(end):
+            cells = [end]
+            while self.prev[cells[-1]] >= 0:
+                cells.append(self.prev[cells[-1]])
+            return [grid.pos(idx) for idx in reversed(cells)]
+        if self.exhaustive and self.g[end] == INF:
+            return []
+        return None
+
+
+class QueryCache(object):
+    def __init__(self, grid, maxsize=QUERY_CACHE_SIZE, tree_size=TREE_CACHE_SIZE):
+        self.grid = grid
+        self.maxsize = maxsize
+        self.tree_size = tree_size
+        self.results = OrderedDict()  # (모드, 대각선, 휴리스틱, 시작점, 끝점) - Result
+        self.trees = OrderedDict()  # (모드, 대각선, 시작점) - Tree
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self.results)
+
+    def get(self, algorithm, delta, start, end, heuristic=None):
+        '''
+        저장해둔 결과 또는 탐색 트리로 답할 수 있으면 Result (확장 수 0), 없으면 None
+        '''
+        key = algorithm, len(delta) > 4, heuristic, start, end
+        result = self.results.get(key)
+        if result is None:
+            tree = self.trees.get((algorithm, len(delta) > 4, start))
+            path = tree.path(self.grid, self.grid.index(*end)) if tree is not None else None
+            if path is None:
+                self.misses += 1
+                return None
+            self.trees.move_to_end((algorithm, len(delta) > 4, start))
+            result = engine.Result(path, algorithms.path_cost(path) if path else None, 0)
+            self.store(self.results, key, result, self.maxsize)
+        else:
+            self.results.move_to_end(key)
+        self.hits += 1
+        return result._replace(expansions=0)
+
+    def put(self, algorithm, delta, start, end, result, heuristic=None):
+        '''
+        결과 저장, 다익스트라 / BFS 는 보드에 남은 탐색 트리도 저장 (탐색 직후에 호출)
+        시작점 / 끝점이 벽이면 탐색하지 않았으므로 (보드에는 이전 질의의 g / prev) 트리는 저장하지 않음
+        '''
+        self.store(self.results, (algorithm, len(delta) > 4, heuristic, start, end), result, self.maxsize)
+        types = self.grid.types
+        searched = self.grid.g is not None and CELL_WALL not in (types[self.grid.index(*start)], types[self.grid.index(*end)])
+        if algorithm in TREE_MODES and start != end and searched:
+            tree = Tree(self.grid, algorithm, self.grid.index(*end), bool(result.path))
+            self.store(self.trees, (algorithm, len(delta) > 4, start), tree, self.tree_size)
+
+    def store(self, entries, key, value, maxsize):
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > maxsize:  # 가장 오래 안 쓴 것부터 버림
+            entries.popitem(last=False)
+
+    def search(self, start, end, algorithm=DEFAULT_MODE, delta=WITHOUT_DIAGONAL, **options):
+        '''
+        캐시로 답할 수 있으면 바로, 아니면 engine.search 로 탐색한 뒤 저장
+        '''
+        heuristic = options.get('heuristic')
+        result = self.get(algorithm, delta, start, end, heuristic)
+        if result is None:
+            result = engine.search(self.grid, start, end, engine.ALGORITHMS[algorithm], delta, **options)
+            self.put(algorithm, delta, start, end, result, heuristic)
+        return result
+
+    def update(self, x, y):
+        '''
+        (x, y) 의 벽이 생기거나 없어진 뒤 호출: 영향을 받을 수 있는 결과 / 트리만 버림
+        벽이 생기면 그 셀을 지나는 경로만 바뀌고, 벽이 없어지면 장애물이 없을 때의 비용과 같은
+        (더 짧아질 수 없는) 경로만 그대로 둠
+        '''
+        idx = self.grid.index(x, y)
+        if self.grid.types[idx] == CELL_WALL:
+            for key, result in list(self.results.items()):
+                if (x, y) in result.path:
+                    del self.results[key]
+            for key, tree in list(self.trees.items()):
+                if tree.g is None or tree.g[idx] < INF:
+                    del self.trees[key]
+            return
+
+        for key, result in list(self.results.items()):
+            _, diagonal, _, (start_x, start_y), (end_x, end_y) = key
+            h_func = algorithms.heuristic_func(WITH_DIAGONAL if diagonal else WITHOUT_DIAGONAL)
+            if not result.path or result.cost > h_func(abs(start_x - end_x), abs(start_y - end_y)):
+                del self.results[key]
+        for key, tree in list(self.trees.items()):
+            # 새로 열린 셀 옆에 트리가 닿지 않았으면 확정된 값은 그대로
+            delta = WITH_DIAGONAL if key[1] else WITHOUT_DIAGONAL
+            if tree.g is None or any(-1 < x + dx < self.grid.width and -1 < y + dy < self.grid.height and tree.g[self.grid.index(x + dx, y + dy)] < INF
+                   for dx, dy in delta):
+                del self.trees[key]
+
+    def clear(self):
+        '''
+        보드 전체가 바뀌었을 때 (벽 모두 지우기, 불러오기)
+        '''
+        self.results.clear()
+        self.trees.clear()
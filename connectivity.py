@@ -0,0 +1,163 @@
+'''
+지도의 연결 요소 인덱스: 두 점이 이어져 있는지 탐색 없이 바로 확인
+
+벽이 없어지면 주변 요소와 합치고(union-find), 벽이 생기면 주변만 다시 번호를 매깁니다.
+번호는 처음 질의할 때 행마다 벽 없는 구간(run)을 윗 행의 겹치는 구간과 합쳐서 한 번에 매깁니다.
+'''
+from array import array
+from collections import deque
+import re
+
+from constants import *
+
+# 한 행에서 벽이 아닌 셀이 이어진 구간
+RUN = re.compile(b'[^' + bytes([CELL_WALL]) + b']+')
+
+
+class Connectivity(object):
+    def __init__(self, width, height, walkable, delta, types=None):
+        self.width = width
+        self.height = height
+        self.walkable = walkable  # walkable(x, y): 보드 안이고 벽이 아니면 True
+        self.delta = delta
+        self.types = types  # 셀 종류 배열 (CELL_WALL 이 벽, 없으면 walkable 로 읽음)
+        self.rebuild()
+
+    def rebuild(self):
+        '''
+        연결 요소 번호 버리기 (다음 질의에서 다시 매김)
+        '''
+        self.labels = None
+        self.parent = []  # 번호별 union-find 부모
+
+    def build(self):
+        '''
+        모든 셀에 연결 요소 번호 매기기 (벽은 -1)
+        '''
+        width, height = self.width, self.height
+        if self.types is not None:
+            types = bytes(self.types)
+        else:
+            types = bytes(CELL_EMPTY if self.walkable(x, y) else CELL_WALL for y in range(height) for x in range(width))
+        reach = 1 if len(self.delta) > 4 else 0  # 대각선 이동이면 모서리만 닿은 구간도 이어짐
+        self.labels = labels = array('i', [-1]) * (width * height)
+        self.parent = []
+        above = []  # 윗 행의 (시작, 끝, 번호)
+        for y in range(height):
+            row_start = y * width
+            runs = []
+            num = 0
+            for match in RUN.finditer(types, row_start, row_start + width):
+                start, end = match.start() - row_start, match.end() - row_start
+                while num < len(above) and above[num][1] + reach <= start:
+                    num += 1
+                label = None
+                other = num
+                while other < len(above) and above[other][0] < end + reach:  # 윗 행에서 겹치는 구간
+                    if label is None:
+                        label = self.find(above[other][2])
+                    else:
+                        self.union(label, above[other][2])
+                    other += 1
+                if label is None:
+                    label = self.new_label()
+                labels[row_start + start:row_start + end] = array('i', [label]) * (end - start)
+                runs.append((start, end, label))
+            above = runs
+
+    def new_label(self):
+        self.parent.append(len(self.parent))
+        return len(self.parent) - 1
+
+    def find(self, label):
+        root = label
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[label] != root:  # 경로 압축
+            self.parent[label], label = root, self.parent[label]
+        return root
+
+    def union(self, label, other):
+        root, other_root = self.find(label), self.find(other)
+        if root != other_root:
+            self.parent[other_root] = root
+
+    def neighbors(self, x, y):
+        for dx, dy in self.delta:
+            if self.walkable(x + dx, y + dy):
+                yield x + dx, y + dy
+
+    def component(self, x, y):
+        '''
+        (x, y) 의 연결 요소 번호, 벽이면 -1
+        '''
+        if self.labels is None:
+            self.build()
+        label = self.labels[y * self.width + x]
+        return self.find(label) if label >= 0 else -1
+
+    def connected(self, start, end):
+        '''
+        두 위치 (x, y) 사이에 경로가 있는지 O(1) 에 확인
+        '''
+        component = self.component(*start)
+        return component >= 0 and component == self.component(*end)
+
+    def remove_wall(self, x, y):
+        '''
+        (x, y) 의 벽이 없어진 뒤 호출: 이웃 요소들과 합치기
+        '''
+        idx = y * self.width + x
+        if self.labels is None or self.labels[idx] >= 0:  # 번호를 아직 매기지 않았으면 매길 때 반영
+            return
+        label = self.new_label()
+        self.labels[idx] = label
+        for new_x, new_y in self.neighbors(x, y):
+            self.union(label, self.labels[new_y * self.width + new_x])
+
+    def add_wall(self, x, y):
+        '''
+        (x, y) 에 벽이 생긴 뒤 호출: 이웃들에서 번갈아 BFS 를 돌려
+        서로 만나지 못하고 먼저 끝난(갈라진) 영역에만 새 번호 매기기
+        '''
+        idx = y * self.width + x
+        if self.labels is None or self.labels[idx] < 0:
+            return
+        self.labels[idx] = -1
+        seeds = list(self.neighbors(x, y))
+        if len(seeds) < 2:
+            return
+
+        owner = {seed: num for num, seed in enumerate(seeds)}  # 셀 - 처음 방문한 탐색 번호
+        merged = list(range(len(seeds)))  # 합쳐진 탐색의 대표 번호
+        queues = [deque([seed]) for seed in seeds]
+        visited = [[seed] for seed in seeds]
+        alive = set(range(len(seeds)))
+
+        def root(num):
+            while merged[num] != num:
+                num = merged[num]
+            return num
+
+        while len(alive) > 1:
+            for num in list(alive):
+                if num not in alive:
+                    continue
+                if not queues[num]:  # 다른 탐색과 만나지 못한 채 끝남: 갈라진 영역
+                    label = self.new_label()
+                    for cell_x, cell_y in visited[num]:
+                        self.labels[cell_y * self.width + cell_x] = label
+                    alive.remove(num)
+                    continue
+                for pos in self.neighbors(*queues[num].popleft()):
+                    if pos not in owner:
+                        owner[pos] = num
+                        visited[num].append(pos)
+                        queues[num].append(pos)
+                        continue
+                    other = root(owner[pos])
+                    if other != num:  # 다른 탐색과 만남: 같은 영역이므로 합치기
+                        merged[other] = num
+                        queues[num].extend(queues[other])
+                        visited[num].extend(visited[other])
+                        alive.discard(other)
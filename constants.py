@@ -1,10 +1,15 @@
-import pygame
-
-# 보드 크기
+# 보드 크기 (지도를 불러오면 지도 크기, 화면은 셀 CELL_SIZE 픽셀로 기본 보드가 들어가는 크기)
 CELL_SIZE = 30
 WIDTH_CNT = 30
 HEIGHT_CNT = 30
 
+# 보드 화면 확대 단계 (셀 하나의 픽셀 수, 1 보다 작으면 픽셀 하나에 여러 셀 중 하나만 칠함)
+ZOOM_LEVELS = (1 / 32, 1 / 16, 1 / 8, 1 / 4, 1 / 3, 1 / 2, 1, 2, 3, 4, 6, 8, 12, 16, 20, 30, 45, 60)
+GRID_LINE_SIZE = 6  # 셀이 이 픽셀 수 이상이면 칸 경계선을 그림
+MARK_SIZE = 5  # 셀이 이 픽셀 수보다 작으면 시작점 / 끝점은 이 크기로 표시
+DIRTY_CELLS = 4096  # 한 프레임에 바뀐 셀이 이보다 많으면 바뀐 영역 대신 보드 화면 전체를 다시 칠함
+DIRTY_TILE = 64  # 바뀐 셀은 화면을 이 픽셀 크기 칸으로 나눠 칸마다 한 영역으로 묶어 다시 칠함
+
 # 패널 크기
 WIDTH_PANEL = 150
 MARGIN_PANEL = 20
@@ -12,13 +17,54 @@ MODE_HEIGHT = 40
 
 # 클래스 상수
 FPS = 120
+STEPS_PER_FRAME = 1  # 프레임마다 실행할 알고리즘 단계 수
+FRAME_BUDGET = 0.004  # 시간 예산 모드에서 프레임마다 알고리즘에 쓰는 시간(초)
+FINISH_SLICE = 0.05  # 끝까지 실행 모드에서 입력을 확인하는 간격(초)
+HUD_FRAMES = 60  # 패널의 계측 값은 최근 프레임 수만큼의 평균
+HUD_INTERVAL = 0.25  # 패널의 계측 값을 다시 그리는 간격(초)
 DEFAULT_MODE = 'BFS'
 WITHOUT_DIAGONAL = ((0, -1), (-1, 0), (0, 1), (1, 0))
 WITH_DIAGONAL = ((0, -1), (-1, 0), (0, 1), (1, 0), (-1, -1), (-1, 1), (1, 1), (1, -1))
 
+# 알고리즘 단계마다 보고하는 사건 (열린 목록에서 꺼냄 / 새로 넣음 / 비용 갱신 / 끝점 도착)
+EVENT_POP = 'pop'
+EVENT_PUSH = 'push'
+EVENT_RELAX = 'relax'
+EVENT_GOAL = 'goal'
+
+# HPA* 클러스터 한 변의 셀 수, 출입구를 양 끝 두 개로 나누는 구간 길이
+CLUSTER_SIZE = 10
+ENTRANCE_SPLIT = 6
+
+# 탐색 배열(g / prev)을 셀 수만큼 만드는 최대 보드 크기, 더 크면 닿은 셀만 저장
+DENSE_CELLS = 1 << 20
+
+# 질의 캐시에 남겨둘 결과 수 / 출발점별 탐색 트리(다익스트라, BFS) 수
+QUERY_CACHE_SIZE = 256
+TREE_CACHE_SIZE = 8
+
+# 일괄 질의 작업자마다 남겨둘 끝점별 흐름장 수
+FIELD_CACHE_SIZE = 4
+
+# 이동 비용 (대각선은 약 √2 배, 정수로 유지)
+COST_STRAIGHT = 10
+COST_DIAGONAL = 14
+
 # 폰트
 PATH_FONT = 'font/gulim.ttf'
 
+# 시뮬레이터에서 S / L 키로 저장 / 불러오는 보드 파일
+PATH_BOARD = 'board.grid'
+
+# 시뮬레이터에서 E 키로 저장하는 마지막 실행의 계측 추적 파일
+PATH_TRACE = 'trace.json'
+
+# 시뮬레이터에서 W 키로 저장하고 R 키로 다시 보는 탐색 기록 파일
+PATH_RECORDING = 'search.rec'
+
+# 탐색 기록을 다시 볼 때 키프레임(셀 종류 사본) 사이의 최소 사건 수
+KEYFRAME_EVENTS = 2048
+
 # 색깔
 COLOR_BLACK = 0, 0, 0
 COLOR_RED = 255, 0, 0
@@ -29,13 +75,32 @@ COLOR_GREEN = 0, 255, 0
 COLOR_LIGHT_BLUE = 127, 255, 255
 COLOR_WHITE = 255, 255, 255
 COLOR_GRAY = 127, 127, 127
+COLOR_PINK = 255, 127, 255
+COLOR_LIGHT_PINK = 255, 191, 255
+
+# 셀 종류 (Grid.types 배열 값), 알고리즘은 CELL_WALL 만 확인
+CELL_EMPTY = 0
+CELL_WALL = 1
+CELL_START = 2
+CELL_END = 3
+CELL_OPEN = 4
+CELL_CLOSED = 5
+CELL_OPEN_BACK = 6
+CELL_CLOSED_BACK = 7
+
+# 셀 종류별 색
+TYPE_COLORS = (COLOR_WHITE, COLOR_GRAY, COLOR_GREEN, COLOR_RED,
+               COLOR_LIGHT_GREEN, COLOR_LIGHT_BLUE, COLOR_LIGHT_PINK, COLOR_PINK)
+
+# 탐색 중 자료구조에서 빠진 / 들어온 셀 종류 (정방향, 양방향 탐색의 역방향)
+FRONTIER_TYPES = ((CELL_CLOSED, CELL_OPEN), (CELL_CLOSED_BACK, CELL_OPEN_BACK))
+SEARCH_TYPES = {CELL_OPEN, CELL_CLOSED, CELL_OPEN_BACK, CELL_CLOSED_BACK}
+
+# 탐색 표시로 덮어쓰지 않는 셀 종류
+BOARD_TYPES = {CELL_WALL, CELL_START, CELL_END}
+
+# 흐름장 모드의 거리 히트맵 (끝점에 가까운 색, 먼 색, 색 단계 수)
+HEAT_COLORS = (COLOR_ORANGE, COLOR_LIGHT_BLUE)
+HEAT_LEVELS = 32
+
 
-# 마웃스 / 키 입력
-MOUSEBUTTONDOWN = pygame.MOUSEBUTTONDOWN
-MOUSEMOTION = pygame.MOUSEMOTION
-MOUSEBUTTONUP = pygame.MOUSEBUTTONUP
-KEYUP = pygame.KEYUP
-QUIT = pygame.QUIT
-K_ESCAPE = pygame.K_ESCAPE 
-K_SPACE = pygame.K_SPACE
-LEFT_CLICK = (1, 0, 0)
\ No newline at end of file
@@ -0,0 +1,192 @@
+'''
+D* Lite: 끝점에서 거꾸로 탐색한 g / rhs 값을 질의 사이에 유지하는 증분 탐색
+
+벽이 바뀌거나 시작점이 옮겨지면 영향을 받는 셀만 다시 확장해서 경로를 고칩니다.
+(끝점이 바뀌면 처음부터 다시 탐색)
+
+    planner = DStarLite(grid, start, end, delta)
+    planner.plan()              # 처음 탐색, 확장한 셀 수 반환
+    grid.types[idx] = CELL_WALL
+    planner.update_cell(idx)    # 벽을 고친 셀마다 호출
+    planner.plan()              # 바뀐 부분만 다시 확장
+'''
+import heapq
+
+from algorithms import grid_moves, heuristic_func, trace_path
+from constants import *
+from grid import INF, search_array
+
+
+class DStarLite(object):
+    def __init__(self, grid, start, end, delta, heuristic=None):
+        self.grid = grid
+        self.start = start
+        self.end = end
+        self.delta = delta
+        self.heuristic = heuristic
+        self.h_func = heuristic_func(delta, heuristic)
+        self.moves = grid_moves(grid, delta)
+        self.km = 0  # 시작점이 옮겨간 거리의 합 (이전 key 를 그대로 쓰기 위한 보정)
+        self.g = search_array(grid.size, INF)  # 끝점까지의 거리
+        self.rhs = search_array(grid.size, INF)  # 이웃의 g 로 본 끝점까지의 거리 (g 와 다르면 다시 확장할 셀)
+        self.rhs[end] = 0
+        self.heap = []
+        self.keys = {}  # 열린 목록의 셀 - 현재 key (지연 삭제)
+        self.stale = 0  # 꺼낼 때 버린 갱신 전 항목 수
+        self.expansions = 0  # 마지막 plan 이후 확장한 셀 수
+        self.push(end)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def h(self, idx, other):
+        width = self.grid.width
+        return self.h_func(abs(idx % width - other % width), abs(idx // width - other // width))
+
+    def key(self, idx):
+        g = min(self.g[idx], self.rhs[idx])
+        return g + self.h(self.start, idx) + self.km, g
+
+    def push(self, idx):
+        key = self.key(idx)
+        self.keys[idx] = key
+        heapq.heappush(self.heap, (key, idx))
+
+    def top(self):
+        while self.heap:
+            key, idx = self.heap[0]
+            if self.keys.get(idx) == key:
+                return key, idx
+            heapq.heappop(self.heap)
+            self.stale += 1
+        return None
+
+    def neighbors(self, idx):
+        '''
+        벽이 아닌 이웃 셀과 이동 비용
+        '''
+        types, width, height = self.grid.types, self.grid.width, self.grid.height
+        x, y = idx % width, idx // width
+        for dx, dy, offset, cost in self.moves:
+            if -1 < x + dx < width and -1 < y + dy < height and types[idx + offset] != CELL_WALL:
+                yield idx + offset, cost
+
+    def update_vertex(self, idx, events=None):
+        if idx != self.end:
+            if self.grid.types[idx] == CELL_WALL:
+                self.rhs[idx] = INF
+            else:
+                self.rhs[idx] = min((cost + self.g[other] for other, cost in self.neighbors(idx) if self.g[other] < INF), default=INF)
+        queued = idx in self.keys
+        self.keys.pop(idx, None)
+        if self.g[idx] != self.rhs[idx]:
+            self.push(idx)
+            if events is not None and not queued and self.grid.types[idx] != CELL_WALL:  # 벽이 된 셀은 보고하지 않음
+                events.append((EVENT_PUSH, idx, 0))
+
+    def update_cell(self, idx):
+        '''
+        셀 idx 가 벽이 되거나 벽에서 풀린 뒤 호출: 그 셀과 이웃의 rhs 다시 계산
+        '''
+        self.expansions = 0
+        self.update_vertex(idx)
+        types, width, height = self.grid.types, self.grid.width, self.grid.height
+        x, y = idx % width, idx // width
+        for dx, dy, offset, _ in self.moves:
+            if -1 < x + dx < width and -1 < y + dy < height and types[idx + offset] != CELL_WALL:
+                self.update_vertex(idx + offset)
+
+    def move_start(self, start):
+        '''
+        시작점이 옮겨갔을 때 호출 (탐색 값은 그대로 두고 key 보정값만 늘림)
+        '''
+        if start != self.start:
+            self.km += self.h(self.start, start)
+            self.start = start
+        self.expansions = 0
+
+    def consistent(self):
+        '''
+        시작점까지의 경로가 확정됐는지 (더 확장할 셀이 없는지)
+        '''
+        top = self.top()
+        return top is None or (top[0] >= self.key(self.start) and self.rhs[self.start] == self.g[self.start])
+
+    def expand(self, events=None):
+        '''
+        열린 목록에서 key 가 가장 작은 셀 하나 확장
+        '''
+        key, idx = self.top()
+        new_key = self.key(idx)
+        if key < new_key:  # 시작점이 옮겨가서 key 가 커진 셀은 다시 넣기만
+            self.push(idx)
+            return
+        heapq.heappop(self.heap)
+        del self.keys[idx]
+        self.expansions += 1
+        if events is not None and self.grid.types[idx] != CELL_WALL:
+            events.append((EVENT_POP, idx, 0))
+        if self.g[idx] > self.rhs[idx]:
+            self.g[idx] = self.rhs[idx]
+        else:
+            self.g[idx] = INF
+            self.update_vertex(idx, events)
+        for other, _ in self.neighbors(idx):
+            self.update_vertex(other, events)
+
+    def plan(self):
+        '''
+        경로가 확정될 때까지 확장, 이번에 확장한 셀 수 반환
+        '''
+        while not self.consistent():
+            self.expand()
+        return self.expansions
+
+    def fresh_expansions(self):
+        '''
+        지금 보드에서 처음부터 탐색했다면 확장했을 셀 수 (다시 확장한 수와 비교용)
+        '''
+        return DStarLite(self.grid, self.start, self.end, self.delta, self.heuristic).plan()
+
+    def path(self):
+        '''
+        시작점에서 g 가 가장 작아지는 이웃을 따라간 셀 인덱스 리스트 (경로가 없으면 빈 리스트)
+        '''
+        if self.g[self.start] == INF:
+            return []
+        path = [self.start]
+        while path[-1] != self.end and len(path) <= self.grid.size:
+            idx = path[-1]
+            path.append(min(self.neighbors(idx), key=lambda neighbor: neighbor[1] + self.g[neighbor[0]])[0])
+        return path
+
+
+def DstarLite_init(grid, start, end, delta, heuristic=None, planner=None):
+    '''
+    D* Lite 모드: planner 를 주면 그 탐색 값을 이어서 쓰고(벽 / 시작점 변경만 다시 확장),
+    끝점이나 보드가 다르면 처음부터 탐색
+    완료되면 찾은 경로를 보드의 prev / g 에 기록
+    '''
+    if planner is None or planner.grid is not grid or planner.end != end or planner.delta != delta:
+        planner = DStarLite(grid, start, end, delta, heuristic)
+    else:
+        planner.move_start(start)
+    events = []
+
+    def DstarLite():
+        events.clear()
+        if not planner.consistent():
+            planner.expand(events)
+            if not planner.consistent():
+                return None
+
+        # 시작점부터 경로를 따라가며 prev / g 기록
+        path = planner.path()
+        trace_path(grid, path)
+        if path:
+            events.append((EVENT_GOAL, end, 0))
+        return 'complete'
+
+    DstarLite.planner = planner
+    DstarLite.events = events
+    return planner, DstarLite
@@ -0,0 +1,206 @@
+'''
+pygame 없이 길찾기 알고리즘을 끝까지 실행하는 헤드리스 엔진
+
+    python3 engine.py map.txt 0,0 29,29 -a A* -d
+'''
+import argparse
+from collections import namedtuple
+import inspect
+
+import algorithms
+import dstar
+from connectivity import Connectivity
+from constants import *
+from grid import Grid, is_grid_file, is_wall, open_grid, save_grid
+import hpa
+from instrument import Instrument
+from queues import QUEUES
+from replay import Recording
+
+try:
+    import field  # 흐름장 모드는 numpy 가 있을 때만
+except ImportError:
+    field = None
+
+
+# 모드 이름 - 알고리즘 초기화 함수
+ALGORITHMS = {
+    'BFS': algorithms.BFS_init,
+    'A*': algorithms.Astar_init,
+    'Dijkstra': algorithms.dijkstra_init,
+    'JPS': algorithms.JPS_init,
+    'JPS+': algorithms.JPSplus_init,
+    'HPA*': hpa.HPA_init,
+    'D* Lite': dstar.DstarLite_init,
+    'Bi-BFS': algorithms.biBFS_init,
+    'Bi-Dijkstra': algorithms.biDijkstra_init,
+    'Bi-A*': algorithms.biAstar_init,
+}
+if field is not None:
+    ALGORITHMS['Flow field'] = field.flow_init
+
+# 한 단계에 여러 칸을 건너뛰어 열린 목록 key 가 BUCKET_SPAN 보다 크게 늘 수 있는 모드 (버킷 큐 사용 불가)
+LONG_MOVES = {'JPS', 'JPS+', 'HPA*'}
+
+# key 가 단조일 때만 쓸 수 있는 열린 목록 (queues 참고)
+MONOTONE_QUEUES = {'bucket', 'radix'}
+
+# 탐색 결과: 경로(위치 튜플 리스트, 경로가 없으면 빈 리스트), 경로 비용, 확장한 셀 수
+Result = namedtuple('Result', ['path', 'cost', 'expansions'])
+
+
+def init_options(algorithm, options, delta):
+    '''
+    options 중 algorithm 의 초기화 함수가 받는 것만 (열린 목록 / 휴리스틱을 고를 수 없는 모드는 빼고)
+    열린 목록의 key 가 맞지 않으면 기본 열린 목록: LONG_MOVES 는 버킷 큐 범위를 넘고,
+    대각선 이동에서 octile 외의 휴리스틱은 일관되지 않아 key 가 줄어들 수 있음
+    '''
+    parameters = inspect.signature(ALGORITHMS[algorithm]).parameters
+    accepted = {name: value for name, value in options.items() if name in parameters}
+    queue = accepted.get('queue')
+    if queue == 'bucket' and algorithm in LONG_MOVES:
+        del accepted['queue']
+    elif queue in MONOTONE_QUEUES and len(delta) > 4 and accepted.get('heuristic') not in (None, 'octile'):
+        del accepted['queue']
+    return accepted
+
+
+def as_grid(grid):
+    '''
+    2차원 지도(행 리스트)면 보드 배열로 바꾸고, 이미 Grid 면 그대로
+    '''
+    return grid if isinstance(grid, Grid) else Grid.from_rows(grid)
+
+
+def build_connectivity(grid, diagonal=False):
+    '''
+    지도 grid(행 리스트 또는 Grid) 의 연결 요소 인덱스 (grid 를 고친 뒤에는 add_wall / remove_wall 로 갱신)
+    '''
+    delta = WITH_DIAGONAL if diagonal else WITHOUT_DIAGONAL
+    if isinstance(grid, Grid):
+        return Connectivity(grid.width, grid.height, algorithms.walkable_func(grid), delta, grid.types)
+    height, width = len(grid), len(grid[0])
+
+    def walkable(x, y):
+        return -1 < x < width and -1 < y < height and not is_wall(grid[y][x])
+
+    return Connectivity(width, height, walkable, delta)
+
+
+def load_map(path):
+    '''
+    텍스트 지도 파일 읽기 (한 줄이 한 행)
+    '''
+    with open(path) as f:
+        return [line.rstrip('\n') for line in f if line.strip()]
+
+
+def load_board(path):
+    '''
+    .grid 파일은 메모리 매핑한 보드로, 그 외에는 텍스트 지도(행 리스트)로 읽기
+    '''
+    return open_grid(path) if is_grid_file(path) else load_map(path)
+
+
+def search(grid, start, end, init_func, delta, observer=None, **options):
+    '''
+    보드 grid 위에서 start 부터 end 까지(각각 (x, y)) 알고리즘을 완료될 때까지 실행
+    (options 는 초기화 함수에 그대로 전달)
+    observer(data, func) 를 주면 시작 전과 매 단계 뒤에 호출 (측정용)
+    시작점 / 끝점이 벽이면 탐색 없이 실패, 탐색 중에만 시작점 / 끝점을 표시하고 끝나면 원래 셀 종류로 되돌림
+    '''
+    start_idx, end_idx = grid.index(*start), grid.index(*end)
+    if grid.types[start_idx] == CELL_WALL or grid.types[end_idx] == CELL_WALL:
+        return Result([], None, 0)
+    if start_idx == end_idx:
+        return Result([start], 0, 0)
+
+    saved = grid.types[start_idx], grid.types[end_idx]
+    grid.types[start_idx] = CELL_START
+    grid.types[end_idx] = CELL_END
+    try:
+        data, func = init_func(grid, start_idx, end_idx, delta, **options)
+        expansions = 0
+        status = None
+        if observer is not None:
+            observer(data, func)
+        while not status:
+            status = func()
+            expansions += 1
+            if observer is not None:
+                observer(data, func)
+    finally:
+        grid.types[start_idx], grid.types[end_idx] = saved
+
+    # 끝점에서 prev 를 따라가며 최단 경로 계산
+    path = grid.path(end_idx)
+    if not path:
+        return Result([], None, expansions)
+    return Result(path, algorithms.path_cost(path), expansions)
+
+
+def solve(grid, start, end, algorithm=DEFAULT_MODE, diagonal=False, connectivity=None, **options):
+    '''
+    지도 grid(행 리스트 또는 Grid) 위에서 start 부터 end 까지(각각 (x, y)) 최단 경로 탐색
+    (A* 의 heuristic 처럼 알고리즘별 옵션은 키워드로 전달)
+    connectivity 인덱스를 주면 이어지지 않은 질의는 탐색 없이 바로 실패
+    '''
+    if connectivity is not None and start != end and not connectivity.connected(start, end):
+        return Result([], None, 0)
+    delta = WITH_DIAGONAL if diagonal else WITHOUT_DIAGONAL
+    return search(as_grid(grid), start, end, ALGORITHMS[algorithm], delta, **options)
+
+
+def parse_pos(text):
+    x, y = text.split(',')
+    return int(x), int(y)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Headless pathfinding')
+    parser.add_argument('map', help='지도 파일 (.grid 또는 텍스트 지도: . 빈 공간, 그 외 벽)')
+    parser.add_argument('start', type=parse_pos, help='시작점 x,y')
+    parser.add_argument('end', type=parse_pos, help='끝점 x,y')
+    parser.add_argument('-a', '--algorithm', default=DEFAULT_MODE, choices=list(ALGORITHMS))
+    parser.add_argument('-d', '--diagonal', action='store_true', help='대각선 이동 허용')
+    parser.add_argument('--heuristic', choices=list(algorithms.HEURISTICS), help='A* 휴리스틱 (기본: 이동 방식에 맞게)')
+    parser.add_argument('--queue', choices=list(QUEUES), help='다익스트라 / A* 열린 목록 구현 (기본: binary)')
+    parser.add_argument('--save', metavar='PATH', help='탐색 전에 지도를 .grid 파일로 저장')
+    parser.add_argument('--trace', metavar='PATH', help='단계마다 계측한 추적을 JSON 파일로 저장')
+    parser.add_argument('--record', metavar='PATH', help='단계마다 사건을 기록해 시뮬레이터에서 다시 볼 수 있는 파일로 저장')
+    args = parser.parse_args(argv)
+    if args.diagonal and args.heuristic == 'manhattan':
+        parser.error('--heuristic manhattan is not admissible with diagonal moves (-d)')
+
+    options = {'heuristic': args.heuristic} if args.heuristic else {}
+    if args.queue:
+        options['queue'] = args.queue
+    options = init_options(args.algorithm, options, WITH_DIAGONAL if args.diagonal else WITHOUT_DIAGONAL)
+    board = as_grid(load_board(args.map))
+    if args.save:
+        save_grid(board, args.save)
+    observers = []
+    if args.trace:
+        instrument = Instrument()
+        instrument.begin(mode=args.algorithm, map=args.map, width=board.width, height=board.height,
+                         diagonal=args.diagonal, start=args.start, end=args.end)
+        observers.append(instrument.observer)
+    if args.record:
+        recording = Recording(board, mode=args.algorithm, diagonal=args.diagonal)
+        observers.append(recording.observer)
+    if observers:
+        options['observer'] = lambda data, func: [observer(data, func) for observer in observers]
+    result = solve(board, args.start, args.end, args.algorithm, args.diagonal, **options)
+    if args.trace:
+        instrument.finish(cost=result.cost, length=len(result.path))
+        instrument.save(args.trace)
+    if args.record:
+        recording.finish([board.index(*pos) for pos in result.path])
+        recording.save(args.record)
+    print('Path: {}'.format(result.path))
+    print('Cost: {}'.format(result.cost))
+    print('Expansions: {}'.format(result.expansions))
+
+
+if __name__ == '__main__':
+    main()
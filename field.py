@@ -0,0 +1,151 @@
+'''
+흐름장(flow field): 끝점 하나에서 보드 전체로 거리장을 NumPy 배열 연산으로 퍼뜨리고
+셀마다 끝점 쪽 다음 셀을 정해서, 같은 끝점으로 가는 에이전트는 몇 명이든 탐색 없이 따라가기만 함
+
+한 단계(sweep)는 지난 단계에 거리가 줄어든 셀(파면)의 이웃을 배열 연산으로 한꺼번에 완화하고,
+더 줄어드는 셀이 없으면 완료 (한 칸씩 확장하는 다익스트라 / BFS 대신 파면 하나를 통째로 처리)
+
+    flow = FlowField(grid, goal, delta).compute()
+    flow.path(start)            # 시작점에서 끝점까지 셀 인덱스 리스트
+    flow.next[idx]              # 셀 idx 에서 끝점 쪽 다음 셀 (-1: 끝점 / 닿을 수 없음)
+
+numpy 가 필요합니다 (없으면 엔진 / 시뮬레이터에 흐름장 모드가 나타나지 않음).
+'''
+import numpy as np
+
+from algorithms import grid_moves, trace_path
+from constants import *
+from grid import INF
+
+
+def shifted(dx, dy, width, height):
+    '''
+    셀 (x, y) 와 이웃 (x + dx, y + dy) 가 모두 보드 안인 영역의 (셀 쪽, 이웃 쪽) 슬라이스
+    '''
+    cells = slice(max(-dy, 0), height - max(dy, 0)), slice(max(-dx, 0), width - max(dx, 0))
+    neighbors = slice(max(dy, 0), height + min(dy, 0)), slice(max(dx, 0), width + min(dx, 0))
+    return cells, neighbors
+
+
+class FlowField(object):
+    def __init__(self, grid, goal, delta):
+        self.grid = grid
+        self.goal = goal
+        self.delta = delta
+        self.walls = np.frombuffer(grid.types, dtype=np.uint8) == CELL_WALL  # 만든 때의 벽 (보드를 고치면 새로 만들어야 함)
+        self.moves = grid_moves(grid, delta)
+        self.dist = np.full(grid.size, INF, dtype=np.int64)  # 끝점까지의 거리
+        self.dist[goal] = 0
+        self.active = np.array([goal])  # 지난 단계에 거리가 줄어든 셀 (이웃만 다시 완화)
+        self.next = None  # 완료되면 셀마다 끝점 쪽 다음 셀 인덱스
+        self.sweeps = 0
+
+    def matches(self, grid, goal, delta):
+        '''
+        같은 보드 / 끝점 / 이동 방식이고 만든 뒤로 벽이 바뀌지 않았는지 (그대로 다시 쓸 수 있는지)
+        '''
+        return (self.grid is grid and self.goal == goal and self.delta == delta
+                and np.array_equal(self.walls, np.frombuffer(grid.types, dtype=np.uint8) == CELL_WALL))
+
+    def __len__(self):  # 다음 단계에 이웃을 완화할 셀 수 (열린 목록 크기 대신)
+        return len(self.active)
+
+    @property
+    def done(self):
+        return self.next is not None
+
+    def step(self):
+        '''
+        지난 단계에 거리가 줄어든 셀들의 이웃을 한꺼번에 완화하고, 이번에 처음 닿은 셀 인덱스 배열 반환
+        (줄어든 셀이 없으면 흐름 계산 후 완료)
+        '''
+        dist, active = self.dist, self.active
+        width, height = self.grid.width, self.grid.height
+        x, y = active % width, active // width
+        targets, values = [], []
+        for dx, dy, offset, cost in self.moves:
+            sources = active[(-1 < x + dx) & (x + dx < width) & (-1 < y + dy) & (y + dy < height)]
+            targets.append(sources + offset)
+            values.append(dist[sources] + cost)
+        targets, values = np.concatenate(targets), np.concatenate(values)
+        better = ~self.walls[targets] & (values < dist[targets])
+        targets, values = targets[better], values[better]
+        reached = np.unique(targets[dist[targets] == INF])
+        np.minimum.at(dist, targets, values)  # 같은 셀로 여러 번 완화하면 가장 작은 값
+        self.active = np.unique(targets)
+        self.sweeps += 1
+        if not self.active.size:
+            self.next = self.flow()
+        return reached
+
+    def compute(self):
+        while not self.done:
+            self.step()
+        return self
+
+    def flow(self):
+        '''
+        셀마다 (이웃 거리 + 이동 비용) 이 가장 작은 이웃의 인덱스 (끝점 / 닿을 수 없는 셀은 -1)
+        '''
+        width, height = self.grid.width, self.grid.height
+        dist = self.dist.reshape(height, width)
+        candidates = np.full((len(self.moves), height, width), 2 * INF, dtype=np.int64)
+        for num, (dx, dy, _, cost) in enumerate(self.moves):
+            cells, neighbors = shifted(dx, dy, width, height)
+            candidates[num][cells] = dist[neighbors] + cost
+        offsets = np.array([offset for _, _, offset, _ in self.moves])
+        next_cells = np.arange(self.grid.size) + offsets[candidates.argmin(axis=0).ravel()]
+        next_cells[self.dist == INF] = -1
+        next_cells[self.goal] = -1
+        return next_cells
+
+    def distance(self, idx):
+        return int(self.dist[idx])
+
+    def path(self, start):
+        '''
+        start 에서 흐름을 따라 끝점까지 간 셀 인덱스 리스트 (닿을 수 없으면 빈 리스트)
+        '''
+        if self.dist[start] == INF:
+            return []
+        path = [start]
+        while path[-1] != self.goal:
+            path.append(int(self.next[path[-1]]))
+        return path
+
+    def heat_levels(self, levels):
+        '''
+        셀마다 끝점까지 거리를 0 ~ levels - 1 단계로 나눈 배열 (닿을 수 없는 셀은 -1)
+        '''
+        reachable = self.dist < INF
+        farthest = max(int(self.dist[reachable].max()), 1)
+        return np.where(reachable, self.dist * (levels - 1) // farthest, -1)
+
+
+def flow_init(grid, start, end, delta, field=None):
+    '''
+    흐름장 모드: 단계마다 거리장을 파면 하나만큼 퍼뜨리고, 완료되면 시작점의 흐름을 따라간 경로를 prev / g 에 기록
+    field 를 주면 (같은 보드 / 끝점 / 이동 방식, 같은 벽으로 이미 계산한 흐름장) 다시 계산하지 않음
+    '''
+    if field is None or not field.matches(grid, end, delta):
+        field = FlowField(grid, end, delta)
+    grid.reset()
+    events = []
+    frontier = [end]
+
+    def flow():
+        events.clear()
+        if not field.done:
+            events.extend((EVENT_POP, idx, 0) for idx in frontier)
+            frontier[:] = field.step().tolist()
+            events.extend((EVENT_PUSH, idx, 0) for idx in frontier)
+            if not field.done:
+                return None
+
+        trace_path(grid, field.path(start))
+        if grid.g[end] != INF:
+            events.append((EVENT_GOAL, end, 0))
+        return 'complete'
+
+    flow.events = events
+    return field, flow
@@ -0,0 +1,182 @@
+'''
+보드 상태를 셀 객체 대신 평평한 배열들로 저장 (인덱스 = y * width + x)
+
+    types: 셀 종류 (bytearray, CELL_* 값)
+    g: 시작점에서의 비용 (array('i'), 닿지 않은 셀은 INF)
+    prev: 경로상 이전 셀 인덱스 (array('i'), 없으면 -1)
+    g_back / next: 양방향 탐색의 역방향 비용 / 다음 셀 (필요할 때만 만듦)
+탐색 배열은 질의마다 reset 에서 만들고, 셀이 DENSE_CELLS 보다 많은 보드는 배열 대신 닿은 셀만 저장하는 dict
+(큰 지도도 여는 데는 types 만, 질의에는 탐색이 닿은 만큼의 메모리만 필요)
+
+보드 파일 형식 (.grid): 머리말 16 바이트(GRID_MAGIC, 너비, 높이: little-endian uint32) 뒤에
+셀 종류 uint8 배열 (벽 / 빈 공간과 시작점 / 끝점만 저장)
+'''
+from array import array
+from collections import defaultdict
+import itertools
+import mmap
+import struct
+
+from constants import *
+
+INF = 2 ** 31 - 1  # 아직 닿지 않은 셀의 비용
+
+GRID_MAGIC = b'PFGRID01'
+GRID_HEADER = struct.Struct('<8sII')  # 매직, 너비, 높이
+
+# 저장할 때 탐색 중 상태는 빈 공간으로 (bytes.translate 표)
+SAVE_TYPES = bytes(value if value in (CELL_WALL, CELL_START, CELL_END) else CELL_EMPTY for value in range(256))
+
+# 지도 문자 중 지나갈 수 있는 칸
+PASSABLE = '.GS'
+
+
+def is_wall(value):
+    '''
+    지도 한 칸의 값이 벽인지 확인 (문자는 PASSABLE 이외, 숫자는 0 이외가 벽)
+    '''
+    if isinstance(value, str):
+        return value not in PASSABLE
+    return bool(value)
+
+
+def search_array(size, default, typecode='i'):
+    '''
+    셀마다 default 로 시작하는 탐색 배열 (큰 보드는 읽거나 쓴 셀만 저장하는 dict)
+    닫힌 목록 같은 표시는 typecode 'B'
+    '''
+    if size <= DENSE_CELLS:
+        return array(typecode, [default]) * size
+    return defaultdict(itertools.repeat(default).__next__)
+
+
+class Grid(object):
+    def __init__(self, width, height, types=None):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.types = bytearray(self.size) if types is None else types
+        self.g = self.prev = self.g_back = self.next = None  # 탐색 배열, reset 에서 만듦
+
+    @classmethod
+    def from_rows(cls, rows):
+        '''
+        2차원 지도(행 리스트)로 보드 만들기
+        '''
+        types = bytearray(CELL_WALL if is_wall(value) else CELL_EMPTY for row in rows for value in row)
+        return cls(len(rows[0]), len(rows), types)
+
+    def reset(self, back=False):
+        '''
+        탐색 상태 배열 초기화 (back 이면 역방향 배열도)
+        '''
+        self.g = search_array(self.size, INF)
+        self.prev = search_array(self.size, -1)
+        if back:
+            self.g_back = search_array(self.size, INF)
+            self.next = search_array(self.size, -1)
+
+    def index(self, x, y):
+        return y * self.width + x
+
+    def pos(self, idx):
+        return idx % self.width, idx // self.width
+
+    def path(self, end):
+        '''
+        end 에서 prev 를 따라가며 만든 시작점부터의 위치 리스트 (닿지 않았으면 빈 리스트)
+        '''
+        if self.g is None or self.g[end] == INF:
+            return []
+        path = []
+        idx = end
+        while idx >= 0:
+            path.append(self.pos(idx))
+            idx = self.prev[idx]
+        path.reverse()
+        return path
+
+
+def save_grid(grid, path):
+    '''
+    보드를 .grid 파일로 저장
+    '''
+    with open(path, 'wb') as f:
+        f.write(GRID_HEADER.pack(GRID_MAGIC, grid.width, grid.height))
+        f.write(bytes(grid.types).translate(SAVE_TYPES))
+
+
+def is_grid_file(path):
+    with open(path, 'rb') as f:
+        return f.read(len(GRID_MAGIC)) == GRID_MAGIC
+
+
+def open_grid(path):
+    '''
+    .grid 파일을 메모리 매핑으로 열기, 읽은 페이지만 디스크에서 올라오므로 큰 지도도 바로 열림
+    (쓰기 시 복사 매핑이라 탐색 중 셀 종류를 바꿔도 파일은 그대로)
+    '''
+    with open(path, 'rb') as f:
+        magic, width, height = GRID_HEADER.unpack(f.read(GRID_HEADER.size))
+        if magic != GRID_MAGIC:
+            raise ValueError('{}: not a grid file'.format(path))
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    if len(mapped) != GRID_HEADER.size + width * height:
+        raise ValueError('{}: size does not match header {}x{}'.format(path, width, height))
+    return Grid(width, height, memoryview(mapped)[GRID_HEADER.size:])
+
+
+class Cell(object):
+    '''
+    보드 배열의 한 칸을 가리키는 가벼운 뷰 (GUI / 디버그용)
+    '''
+    __slots__ = ('grid', 'idx')
+
+    def __init__(self, grid, idx):
+        self.grid = grid
+        self.idx = idx
+
+    @property
+    def pos(self):  # 셀의 위치 값(튜플)
+        return self.grid.pos(self.idx)
+
+    @property
+    def type(self):  # 셀의 역할 (시작점/끝점/벽/빈공간/탐색 상태)
+        return self.grid.types[self.idx]
+
+    @type.setter
+    def type(self, value):
+        self.grid.types[self.idx] = value
+
+    @property
+    def color(self):
+        return TYPE_COLORS[self.type]
+
+    @property
+    def prev(self):  # 경로상 이전 셀
+        idx = self.grid.prev[self.idx] if self.grid.prev else -1
+        return Cell(self.grid, idx) if idx >= 0 else None
+
+    @property
+    def next(self):  # 양방향 탐색에서 끝점 쪽 다음 셀
+        idx = self.grid.next[self.idx] if self.grid.next else -1
+        return Cell(self.grid, idx) if idx >= 0 else None
+
+    @property
+    def g(self):
+        g = self.grid.g[self.idx] if self.grid.g else INF
+        return float('inf') if g == INF else g
+
+    @property
+    def g_back(self):
+        g = self.grid.g_back[self.idx] if self.grid.g_back else INF
+        return float('inf') if g == INF else g
+
+    def __eq__(self, other):
+        return isinstance(other, Cell) and self.grid is other.grid and self.idx == other.idx
+
+    def __hash__(self):
+        return self.idx
+
+    def __repr__(self):  # print 될 때 위치 출력
+        return str(self.pos)
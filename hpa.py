@@ -0,0 +1,277 @@
+'''
+HPA* (계층적 길찾기): 지도를 클러스터로 나누고 클러스터 사이 출입구와 클러스터 안 거리를
+추상 그래프로 미리 계산해두고, 질의는 추상 그래프에서 찾은 뒤 필요한 구간만 셀 단위로 다듬음
+
+벽이 바뀌면 그 셀 주변의 경계와 노드가 바뀐 클러스터만 다시 계산합니다.
+찾은 경로는 출입구를 지나야 하므로 최단 경로보다 조금 길 수 있습니다.
+'''
+import heapq
+
+from algorithms import grid_moves, heuristic_func, move_cost
+from constants import *
+from grid import INF
+from queues import QUEUES
+
+
+class Hierarchy(object):
+    def __init__(self, grid, delta, cluster_size=CLUSTER_SIZE):
+        self.grid = grid
+        self.delta = delta
+        self.size = cluster_size
+        self.columns = (grid.width + cluster_size - 1) // cluster_size  # 클러스터 열 / 행 수
+        self.rows = (grid.height + cluster_size - 1) // cluster_size
+        self.moves = grid_moves(grid, delta)
+        self.rebuild()
+
+    def rebuild(self):
+        '''
+        모든 경계의 출입구와 클러스터 안 거리 다시 계산
+        '''
+        self.borders = {}  # 경계 - 출입구 (클러스터 쪽 셀, 건너편 셀, 비용) 리스트
+        self.links = {}  # 출입구 셀 - {건너편 셀: 비용}
+        self.nodes = [set() for _ in range(self.columns * self.rows)]  # 클러스터 - 출입구 셀
+        self.intra = [{} for _ in range(self.columns * self.rows)]  # 클러스터 - {셀: {같은 클러스터 셀: 거리}}
+        for cluster_y in range(self.rows):
+            for cluster_x in range(self.columns):
+                for border in (('v', cluster_x, cluster_y), ('h', cluster_x, cluster_y)):
+                    self.set_border(border, self.find_entrances(border))
+        for cluster in range(self.columns * self.rows):
+            self.build_cluster(cluster)
+
+    def cluster(self, idx):
+        x, y = idx % self.grid.width, idx // self.grid.width
+        return (y // self.size) * self.columns + x // self.size
+
+    def bounds(self, cluster):
+        '''
+        클러스터가 차지하는 영역 (x0, y0, x1, y1), 끝은 포함하지 않음
+        '''
+        x0, y0 = cluster % self.columns * self.size, cluster // self.columns * self.size
+        return x0, y0, min(x0 + self.size, self.grid.width), min(y0 + self.size, self.grid.height)
+
+    def find_entrances(self, border):
+        '''
+        클러스터 (cluster_x, cluster_y) 의 오른쪽(v) / 아래쪽(h) 경계를 건너는 출입구 리스트
+        양쪽이 모두 빈 구간마다 짧으면 가운데 하나, 길면 양 끝 두 개
+        대각선 이동이면 직선으로는 건널 수 없는 모서리 통과 자리도 출입구
+        '''
+        kind, cluster_x, cluster_y = border
+        width, height, types = self.grid.width, self.grid.height, self.grid.types
+        if kind == 'v':  # 세로 경계: x = line / line + 1, y 를 따라감
+            line, start, end, limit = (cluster_x + 1) * self.size - 1, cluster_y * self.size, (cluster_y + 1) * self.size, height
+            cell = lambda side, pos: (pos * width + line + side) if -1 < pos < limit else None
+            if line + 1 >= width:
+                return []
+        else:  # 가로 경계: y = line / line + 1, x 를 따라감
+            line, start, end, limit = (cluster_y + 1) * self.size - 1, cluster_x * self.size, (cluster_x + 1) * self.size, width
+            cell = lambda side, pos: ((line + side) * width + pos) if -1 < pos < limit else None
+            if line + 1 >= height:
+                return []
+        end = min(end, limit)
+
+        def open_cell(side, pos):
+            idx = cell(side, pos)
+            return idx is not None and types[idx] != CELL_WALL
+
+        entrances = []
+        segment = []
+        for pos in range(start, end + 1):
+            if pos < end and open_cell(0, pos) and open_cell(1, pos):
+                segment.append(pos)
+                continue
+            if segment:
+                ends = (segment[len(segment) // 2],) if len(segment) < ENTRANCE_SPLIT else (segment[0], segment[-1])
+                entrances.extend((cell(0, pos), cell(1, pos), COST_STRAIGHT) for pos in ends)
+                segment = []
+
+        if len(self.delta) > 4:
+            for pos in range(start, end):
+                for step in (-1, 1):
+                    # 가로 경계의 대각선 중 세로 경계도 건너는 것은 세로 경계 쪽에서 추가
+                    if kind == 'h' and not start <= pos + step < end:
+                        continue
+                    if open_cell(0, pos) and open_cell(1, pos + step) and not open_cell(1, pos) and not open_cell(0, pos + step):
+                        entrances.append((cell(0, pos), cell(1, pos + step), COST_DIAGONAL))
+        return entrances
+
+    def set_border(self, border, entrances):
+        '''
+        경계의 출입구를 바꾸고 출입구 연결 / 클러스터 노드 갱신
+        '''
+        for near, far, _ in self.borders.get(border, ()):
+            for idx, other in ((near, far), (far, near)):
+                del self.links[idx][other]
+                if not self.links[idx]:
+                    del self.links[idx]
+                    self.nodes[self.cluster(idx)].discard(idx)
+        self.borders[border] = entrances
+        for near, far, cost in entrances:
+            for idx, other in ((near, far), (far, near)):
+                self.links.setdefault(idx, {})[other] = cost
+                self.nodes[self.cluster(idx)].add(idx)
+
+    def local_search(self, source, cluster, targets=()):
+        '''
+        클러스터 안에서만 움직이는 다익스트라, (거리, 이전 셀) 딕셔너리 반환
+        targets 가 있으면 모두 확정되는 대로 멈춤
+        '''
+        x0, y0, x1, y1 = self.bounds(cluster)
+        types, width = self.grid.types, self.grid.width
+        dist, prev = {source: 0}, {source: -1}
+        remaining = set(targets)
+        heap = [(0, source)]
+        closed = set()
+        while heap:
+            cost, idx = heapq.heappop(heap)
+            if idx in closed:
+                continue
+            closed.add(idx)
+            remaining.discard(idx)
+            if targets and not remaining:
+                break
+            x, y = idx % width, idx // width
+            for dx, dy, offset, move in self.moves:
+                if x0 <= x + dx < x1 and y0 <= y + dy < y1 and types[idx + offset] != CELL_WALL:
+                    alt = cost + move
+                    if alt < dist.get(idx + offset, INF):
+                        dist[idx + offset] = alt
+                        prev[idx + offset] = idx
+                        heapq.heappush(heap, (alt, idx + offset))
+        return dist, prev
+
+    def build_cluster(self, cluster):
+        '''
+        클러스터 안 출입구 사이의 거리 계산
+        '''
+        nodes = self.nodes[cluster]
+        self.intra[cluster] = {}
+        for node in nodes:
+            dist, _ = self.local_search(node, cluster, nodes)
+            self.intra[cluster][node] = {other: dist[other] for other in nodes if other != node and other in dist}
+
+    def update(self, x, y):
+        '''
+        (x, y) 의 벽이 생기거나 없어진 뒤 호출: 주변 경계의 출입구와 바뀐 클러스터만 다시 계산
+        '''
+        changed = {self.cluster(y * self.grid.width + x)}  # 셀이 속한 클러스터는 안의 거리가 바뀜
+        for border in self.borders_near(x, y):
+            before = [set(self.nodes[cluster]) for cluster in self.border_clusters(border)]
+            self.set_border(border, self.find_entrances(border))
+            for cluster, nodes in zip(self.border_clusters(border), before):
+                if nodes != self.nodes[cluster]:
+                    changed.add(cluster)
+        for cluster in changed:
+            self.build_cluster(cluster)
+
+    def borders_near(self, x, y):
+        '''
+        출입구를 찾을 때 (x, y) 를 보는 경계들
+        '''
+        borders = set()
+        for line in (x - 1, x):  # 세로 경계는 위아래 한 칸씩 넘어서 대각선 출입구를 봄
+            if line >= 0 and line % self.size == self.size - 1:
+                for pos in (y - 1, y, y + 1):
+                    if 0 <= pos < self.grid.height:
+                        borders.add(('v', line // self.size, pos // self.size))
+        for line in (y - 1, y):
+            if line >= 0 and line % self.size == self.size - 1:
+                borders.add(('h', x // self.size, line // self.size))
+        return borders
+
+    def border_clusters(self, border):
+        '''
+        경계의 출입구가 속할 수 있는 클러스터들 (세로 경계는 모서리 건너 클러스터 포함)
+        '''
+        kind, cluster_x, cluster_y = border
+        if kind == 'h':
+            pairs = [(cluster_x, cluster_y), (cluster_x, cluster_y + 1)]
+        else:
+            pairs = [(cluster_x + dx, cluster_y + dy) for dx in (0, 1) for dy in (-1, 0, 1)]
+        return [y * self.columns + x for x, y in pairs if 0 <= x < self.columns and 0 <= y < self.rows]
+
+
+def HPA_init(grid, start, end, delta, heuristic=None, queue='binary', hierarchy=None):
+    '''
+    추상 그래프 위의 A*, 끝점에 닿으면 추상 경로의 구간마다 클러스터 안에서 셀 경로로 다듬음
+    hierarchy 를 주면 미리 계산한 추상 그래프 재사용 (같은 보드 / 이동 방식일 때)
+    '''
+    if hierarchy is None or hierarchy.grid is not grid or hierarchy.delta != delta:
+        hierarchy = Hierarchy(grid, delta)
+    h_func = heuristic_func(delta, heuristic)
+    grid.reset()
+    g, prev, width = grid.g, grid.prev, grid.width
+    end_x, end_y = grid.pos(end)
+
+    def h(idx):
+        return h_func(abs(idx % width - end_x), abs(idx // width - end_y))
+
+    # 시작점 / 끝점을 자기 클러스터의 출입구들과 잇기 (같은 클러스터면 서로도)
+    start_cluster, end_cluster = hierarchy.cluster(start), hierarchy.cluster(end)
+    targets = hierarchy.nodes[start_cluster] | ({end} if start_cluster == end_cluster else set())
+    dist, _ = hierarchy.local_search(start, start_cluster, targets)
+    start_edges = {node: dist[node] for node in targets if node in dist and node != start}
+    dist, _ = hierarchy.local_search(end, end_cluster, hierarchy.nodes[end_cluster])
+    end_edges = {node: dist[node] for node in hierarchy.nodes[end_cluster] if node in dist}
+
+    def neighbors(idx):
+        if idx == start:
+            yield from start_edges.items()
+        else:
+            yield from hierarchy.intra[hierarchy.cluster(idx)].get(idx, {}).items()
+        yield from hierarchy.links.get(idx, {}).items()
+        if idx in end_edges:
+            yield end, end_edges[idx]
+
+    g[start] = 0
+    HPA_open = QUEUES[queue]()
+    HPA_open.push(start, h(start), h(start))
+    closed = set()
+    events = []
+
+    def refine():
+        # 추상 경로를 끝점부터 모은 뒤 구간마다 셀 경로로 prev 다시 잇기
+        nodes = [end]
+        while prev[nodes[-1]] >= 0:
+            nodes.append(prev[nodes[-1]])
+        nodes.reverse()
+        for node, next_node in zip(nodes, nodes[1:]):
+            cluster = hierarchy.cluster(node)
+            if cluster != hierarchy.cluster(next_node):  # 경계를 건너는 한 칸
+                cells = [next_node]
+            else:
+                _, local_prev = hierarchy.local_search(node, cluster, (next_node,))
+                cells = [next_node]
+                while local_prev[cells[-1]] != node:
+                    cells.append(local_prev[cells[-1]])
+            for idx in reversed(cells):
+                (x, y), (prev_x, prev_y) = grid.pos(idx), grid.pos(node)
+                prev[idx] = node
+                g[idx] = g[node] + move_cost(x - prev_x, y - prev_y)
+                node = idx
+
+    def HPA():
+        events.clear()
+        _, idx = HPA_open.pop()
+        closed.add(idx)
+        events.append((EVENT_POP, idx, 0))
+        if idx == end:
+            events.append((EVENT_GOAL, idx, 0))
+            refine()
+            return 'complete'
+
+        for new_idx, cost in neighbors(idx):
+            if new_idx in closed:
+                continue
+            alt = g[idx] + cost
+            if alt < g[new_idx]:
+                events.append((EVENT_RELAX if new_idx in HPA_open else EVENT_PUSH, new_idx, 0))
+                g[new_idx] = alt
+                prev[new_idx] = idx
+                new_h = h(new_idx)
+                HPA_open.push(new_idx, alt + new_h, new_h)
+
+        if not HPA_open:
+            return 'complete'
+
+    HPA.events = events
+    return HPA_open, HPA
@@ -0,0 +1,183 @@
+'''
+계측: 알고리즘 단계마다 확장 / 넣은 수 / 버린(지연 삭제) 항목 수 / 열린 목록 크기 / 시간과,
+화면 프레임마다 입력 / 탐색 / 그리기 시간을 perf_counter 로 기록
+실행 하나의 기록은 JSON 추적 파일로 저장하고, 최근 프레임 평균은 시뮬레이터 패널에 표시
+단계마다의 기록(추적)은 begin(trace=True) 일 때만, 아니면 단계 수만 세고 열린 목록 크기 / 버린 수는 패널에 표시할 때 읽음
+
+    instrument = Instrument()
+    instrument.begin(data, trace=True, mode='A*', width=30, height=30)
+    status = instrument.step(data, func)        # func() 대신 (시간 / 사건 수 기록)
+    with instrument.phase('draw'):
+        ...
+    instrument.end_frame()
+    instrument.save('trace.json')
+
+헤드리스로는 engine.search(..., observer=instrument.observer) 로 단계를 기록
+'''
+from collections import deque
+from contextlib import contextmanager
+import json
+import time
+
+from constants import *
+
+# 단계 / 프레임 기록 항목 (JSON 추적 파일의 열)
+STEP_FIELDS = ['t_ms', 'step_us', 'pops', 'pushes', 'stale', 'open']
+FRAME_FIELDS = ['t_ms', 'frame_ms', 'events_ms', 'search_ms', 'draw_ms', 'steps']
+PHASES = ('events', 'search', 'draw')
+
+
+def open_size(data):
+    # 양방향 탐색은 (정방향, 역방향) 열린 목록 튜플
+    return sum(map(len, data)) if isinstance(data, tuple) else len(data)
+
+
+def stale_count(data):
+    # 지연 삭제로 버린 항목 수 (지연 삭제가 없는 큐는 0)
+    return sum(map(stale_count, data)) if isinstance(data, tuple) else getattr(data, 'stale', 0)
+
+
+class Instrument(object):
+    def __init__(self, window=HUD_FRAMES):
+        self.recent = deque(maxlen=window)  # 최근 프레임 (프레임 / 탐색 / 그리기 시간, 단계 수)
+        self.frame = dict.fromkeys(PHASES, 0.)  # 지금 프레임의 단계별 시간
+        self.frame_steps = 0
+        self.frame_start = time.perf_counter()
+        self.begin()
+        self.recording = False  # begin 을 호출하면 실행 기록 시작
+
+    def begin(self, data=None, trace=True, **meta):
+        '''
+        새 실행 기록 시작, data 는 알고리즘의 열린 목록 (이전 실행에서 버린 항목 수를 빼기 위해)
+        trace 가 거짓이면 단계 / 프레임마다 기록하지 않음 (단계 수만 세서 탐색 속도에 거의 영향 없음)
+        meta 는 추적 파일에 그대로 저장 (모드, 보드 크기, 시작점 / 끝점 등)
+        '''
+        self.meta = meta
+        self.data = data
+        self.tracing = trace
+        self.steps = {field: [] for field in STEP_FIELDS}
+        self.frames = {field: [] for field in FRAME_FIELDS}
+        self.totals = {'steps': 0, 'pops': 0, 'pushes': 0, 'stale': 0, 'peak_open': 0, 'search_ms': 0.}
+        self.open = 0
+        self.last_stale = self.first_stale = 0
+        if data is not None:  # 시작 전에 넣은 셀
+            self.open = self.totals['pushes'] = open_size(data)
+            self.last_stale = self.first_stale = stale_count(data)
+        self.last_observe = None
+        self.start_time = time.perf_counter()
+        self.recording = True
+
+    def finish(self, **result):
+        '''
+        실행 기록 끝 (result 도 추적 파일에 저장: 비용, 경로 길이 등)
+        '''
+        self.meta.update(result)
+        self.recording = False
+
+    def record(self, data, func, seconds):
+        # 단계 하나의 사건 수 / 열린 목록 크기 / 시간 기록
+        pops = pushes = 0
+        for event, _, _ in func.events:
+            if event == EVENT_POP:
+                pops += 1
+            elif event in (EVENT_PUSH, EVENT_RELAX):
+                pushes += 1
+        stale = stale_count(data)
+        self.open = open_size(data)
+        row = (round((time.perf_counter() - self.start_time) * 1000, 3), round(seconds * 1e6, 1),
+               pops, pushes, stale - self.last_stale, self.open)
+        for field, value in zip(STEP_FIELDS, row):
+            self.steps[field].append(value)
+        totals = self.totals
+        totals['steps'] += 1
+        totals['pops'] += pops
+        totals['pushes'] += pushes
+        totals['stale'] += stale - self.last_stale
+        totals['peak_open'] = max(totals['peak_open'], self.open)
+        totals['search_ms'] += seconds * 1000
+        self.last_stale = stale
+        self.frame_steps += 1
+
+    def step(self, data, func):
+        '''
+        알고리즘 한 단계 실행 후 기록, 단계의 반환값(상태) 그대로 반환
+        '''
+        if not self.tracing:
+            self.frame_steps += 1
+            return func()
+        start_time = time.perf_counter()
+        status = func()
+        self.record(data, func, time.perf_counter() - start_time)
+        return status
+
+    def observer(self, data, func):
+        '''
+        engine.search 의 observer: 시작 전 호출은 기준 시각만, 이후 호출마다 직전 호출부터의 시간으로 한 단계 기록
+        '''
+        now = time.perf_counter()
+        if self.last_observe is None:
+            self.last_stale = stale_count(data)
+            self.open = open_size(data)
+            self.totals['pushes'] += self.open  # 시작 전에 넣은 셀
+        else:
+            self.record(data, func, now - self.last_observe)
+        self.last_observe = time.perf_counter()  # 기록에 쓴 시간은 다음 단계에서 제외
+
+    @contextmanager
+    def phase(self, name):
+        '''
+        프레임 안의 한 단계(입력 / 탐색 / 그리기) 시간 재기
+        '''
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.frame[name] += time.perf_counter() - start_time
+
+    def end_frame(self):
+        '''
+        프레임 하나 끝: 최근 프레임에 넣고, 실행 기록 중이면 추적에도 기록
+        '''
+        now = time.perf_counter()
+        frame_time = now - self.frame_start
+        self.recent.append((frame_time, self.frame['search'], self.frame['draw'], self.frame_steps))
+        if self.recording and self.tracing:
+            row = (round((now - self.start_time) * 1000, 3), frame_time * 1000, self.frame['events'] * 1000,
+                   self.frame['search'] * 1000, self.frame['draw'] * 1000, self.frame_steps)
+            for field, value in zip(FRAME_FIELDS, row):
+                self.frames[field].append(round(value, 3) if isinstance(value, float) else value)
+        self.frame = dict.fromkeys(PHASES, 0.)
+        self.frame_steps = 0
+        self.frame_start = now
+
+    def summary(self):
+        '''
+        최근 프레임 평균: 초당 단계 수, 프레임 / 탐색 / 그리기 시간(ms), 열린 목록 크기, 버린 항목 수
+        '''
+        frames = len(self.recent) or 1
+        elapsed = sum(frame_time for frame_time, _, _, _ in self.recent)
+        if self.data is not None:  # 추적하지 않아도 지금 열린 목록에서 바로 읽음
+            self.open = open_size(self.data)
+            stale = stale_count(self.data) - self.first_stale
+        else:
+            stale = self.totals['stale']
+        return {
+            'steps_per_s': sum(steps for _, _, _, steps in self.recent) / elapsed if elapsed else 0.,
+            'frame_ms': elapsed * 1000 / frames,
+            'search_ms': sum(search for _, search, _, _ in self.recent) * 1000 / frames,
+            'draw_ms': sum(draw for _, _, draw, _ in self.recent) * 1000 / frames,
+            'open': self.open,
+            'stale': stale,
+        }
+
+    def trace(self):
+        '''
+        실행 하나의 추적: meta, 합계, 단계 / 프레임 기록(항목별 리스트)
+        '''
+        totals = dict(self.totals, search_ms=round(self.totals['search_ms'], 3))
+        return dict(self.meta, totals=totals, steps=self.steps, frames=self.frames)
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.trace(), f)
+            f.write('\n')
@@ -0,0 +1,177 @@
+'''
+다익스트라 / A* 의 열린 목록(우선순위 큐) 구현
+
+모든 구현이 같은 계약을 따릅니다.
+    push(item, key, tie=0): item 추가, 이미 있으면 key 가 더 작을 때만 갱신 (decrease-key)
+    pop(): key 가 가장 작은 (key, item) 꺼내기
+    peek(): pop 으로 꺼낼 (key, item) 을 꺼내지 않고 확인
+    len(), in, iter: 큐에 남아있는 item 기준
+    stale: 꺼낼 때 버린 갱신 전 항목 수 (지연 삭제, 계측용)
+
+버킷 큐와 기수 힙은 key 가 정수이고 마지막으로 꺼낸 key 보다 작아지지 않을 때(단조)만 쓸 수 있습니다.
+(음이 아닌 간선 비용의 다익스트라, 일관된 휴리스틱의 A*)
+'''
+import heapq
+import itertools
+
+from constants import *
+
+# 버킷 큐에 동시에 들어있을 수 있는 key 범위 (A* 의 f 는 한 번에 최대 이동 비용의 2배까지 커짐)
+BUCKET_SPAN = 2 * COST_DIAGONAL + 1
+
+
+class BinaryHeap(object):
+    '''
+    heapq 기반 이진 힙, 갱신된 item 의 이전 항목은 꺼낼 때 버림 (지연 삭제)
+    같은 key 는 tie 가 작은 것, 그 다음은 먼저 넣은 것 우선
+    '''
+    def __init__(self):
+        self.heap = []
+        self.keys = {}  # item - 현재 key
+        self.counter = itertools.count()
+        self.stale = 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, item):
+        return item in self.keys
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def push(self, item, key, tie=0):
+        if item in self.keys and self.keys[item] <= key:
+            return False
+        self.keys[item] = key
+        heapq.heappush(self.heap, (key, tie, next(self.counter), item))
+        return True
+
+    def peek(self):
+        while True:
+            key, _, _, item = self.heap[0]
+            if self.keys.get(item) == key:
+                return key, item
+            heapq.heappop(self.heap)
+            self.stale += 1
+
+    def pop(self):
+        key, item = self.peek()
+        heapq.heappop(self.heap)
+        del self.keys[item]
+        return key, item
+
+
+class BucketQueue(object):
+    '''
+    Dial 의 버킷 큐, key 마다 버킷 하나를 원형 배열로 돌려 씀
+    같은 key 는 나중에 넣은 것 우선 (A* 에서 더 깊은 셀 먼저)
+    '''
+    def __init__(self, span=BUCKET_SPAN):
+        self.span = span
+        self.buckets = [[] for _ in range(span)]
+        self.current = None  # 가장 작은 key 의 하한 (처음 넣은 key, 이후 마지막으로 꺼낸 key)
+        self.keys = {}
+        self.stale = 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, item):
+        return item in self.keys
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def push(self, item, key, tie=0):
+        if item in self.keys and self.keys[item] <= key:
+            return False
+        if self.current is None:
+            self.current = key
+        if not self.current <= key < self.current + self.span:
+            raise ValueError('key {} out of bucket range [{}, {})'.format(key, self.current, self.current + self.span))
+        self.keys[item] = key
+        self.buckets[key % self.span].append((key, item))
+        return True
+
+    def peek(self):
+        if not self.keys:
+            raise IndexError('peek from empty queue')
+        while True:
+            bucket = self.buckets[self.current % self.span]
+            while bucket:
+                key, item = bucket[-1]
+                if key == self.current and self.keys.get(item) == key:
+                    return key, item
+                bucket.pop()
+                self.stale += 1
+            self.current += 1
+
+    def pop(self):
+        key, item = self.peek()
+        self.buckets[key % self.span].pop()
+        del self.keys[item]
+        return key, item
+
+
+class RadixHeap(object):
+    '''
+    기수 힙, 마지막으로 꺼낸 key 와 다른 최상위 비트 위치별로 버킷을 나눔
+    '''
+    def __init__(self):
+        self.buckets = [[] for _ in range(65)]
+        self.last = 0  # 마지막으로 꺼낸 key
+        self.keys = {}
+        self.stale = 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, item):
+        return item in self.keys
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def push(self, item, key, tie=0):
+        if item in self.keys and self.keys[item] <= key:
+            return False
+        if key < self.last:
+            raise ValueError('key {} smaller than last popped key {}'.format(key, self.last))
+        self.keys[item] = key
+        self.buckets[(key ^ self.last).bit_length()].append((key, item))
+        return True
+
+    def peek(self):
+        if not self.keys:
+            raise IndexError('peek from empty queue')
+        while True:
+            if not self.buckets[0]:
+                # 비어있지 않은 가장 낮은 버킷을 새 최소 key 기준으로 다시 나눔
+                idx = 1
+                while not self.buckets[idx]:
+                    idx += 1
+                bucket, self.buckets[idx] = self.buckets[idx], []
+                fresh = [(key, item) for key, item in bucket if self.keys.get(item) == key]
+                self.stale += len(bucket) - len(fresh)
+                bucket = fresh
+                if not bucket:
+                    continue
+                self.last = min(key for key, _ in bucket)
+                for key, item in bucket:
+                    self.buckets[(key ^ self.last).bit_length()].append((key, item))
+
+            key, item = self.buckets[0][-1]
+            if self.keys.get(item) == key:
+                return key, item
+            self.buckets[0].pop()
+            self.stale += 1
+
+    def pop(self):
+        key, item = self.peek()
+        self.buckets[0].pop()
+        del self.keys[item]
+        return key, item
+
+
+QUEUES = {'binary': BinaryHeap, 'bucket': BucketQueue, 'radix': RadixHeap}
@@ -0,0 +1,176 @@
+'''
+탐색 기록: 단계마다 알고리즘이 보고한 사건을 배열에 (셀 인덱스, 사건 종류, 값) 으로 쌓아두고
+다시 탐색하지 않고 아무 단계로나 옮겨가며 보드 상태를 재현
+
+단계 번호는 사건마다 저장하지 않고 단계마다 첫 사건 위치(offsets)로, 값은 사건 직후 그 셀의 g
+보드 상태는 키프레임(일정 사건 수마다 셀 종류 사본)에서 가장 가까운 것을 복사한 뒤 남은 사건만 적용
+
+    recording = Recording(grid, mode='A*')
+    engine.search(grid, start, end, init_func, delta, recording.observer)
+    recording.finish(path_cells)
+    recording.save('search.rec')
+    Recording.load('search.rec').state(120)     # 120 단계 뒤의 셀 종류 배열
+
+기록 파일 형식 (.rec): 머리말(REC_MAGIC, 너비, 높이, 단계 수, 사건 수, 경로 길이, meta 길이) 뒤에
+보드(uint8), 단계 시작 위치 / 셀 / 값(int32), 사건 종류(int8), 경로(int32), meta(JSON)
+'''
+from array import array
+import bisect
+import json
+import struct
+import sys
+
+from constants import *
+from grid import INF, SAVE_TYPES
+
+REC_MAGIC = b'PFREC001'
+REC_HEADER = struct.Struct('<8sIIIIII')  # 매직, 너비, 높이, 단계 수, 사건 수, 경로 길이, meta 길이
+
+# 사건 종류 번호 (기록에는 번호 * 2 + 방향)
+EVENT_CODES = (EVENT_POP, EVENT_PUSH, EVENT_RELAX, EVENT_GOAL)
+
+
+def write_array(f, values):
+    if sys.byteorder != 'little':  # 파일은 little-endian
+        values = array(values.typecode, values)
+        values.byteswap()
+    values.tofile(f)
+
+
+def read_array(f, typecode, count):
+    values = array(typecode)
+    values.fromfile(f, count)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+
+class Recording(object):
+    def __init__(self, grid, **meta):
+        self.width = grid.width
+        self.height = grid.height
+        self.size = grid.size
+        self.grid = grid
+        self.board = bytes(grid.types).translate(SAVE_TYPES)  # 탐색 전 벽 / 시작점 / 끝점
+        self.meta = meta  # 모드, 이동 방식 등 (저장할 때 JSON)
+        self.offsets = array('i', [0])  # 단계 i 의 사건은 offsets[i] ~ offsets[i + 1]
+        self.cells = array('i')
+        self.kinds = array('b')
+        self.values = array('i')
+        self.path = array('i')  # 찾은 경로의 셀 인덱스
+        self.keyframes = None  # 셀 종류 사본 리스트, 처음 옮겨갈 때 만듦
+        self.keyframe_steps = None  # 키프레임마다 단계
+        self.cell_events = None  # 셀 - 사건 위치 리스트, 처음 값을 찾을 때 만듦
+        self.observed = False
+
+    def __len__(self):  # 단계 수
+        return len(self.offsets) - 1
+
+    def add(self, events):
+        '''
+        단계 하나의 사건 기록 (값은 방금 단계가 끝난 보드의 g / g_back)
+        '''
+        grid = self.grid
+        for event, idx, side in events:
+            g = grid.g_back if side else grid.g
+            self.cells.append(idx)
+            self.kinds.append(EVENT_CODES.index(event) * 2 + side)
+            self.values.append(g[idx] if g else INF)
+        self.offsets.append(len(self.cells))
+
+    def observer(self, data, func):
+        '''
+        engine.search 의 observer (시작 전 호출에서는 시작점 / 끝점을 놓은 보드를 다시 찍어둠)
+        '''
+        if self.observed:
+            self.add(func.events)
+        else:
+            self.board = bytes(self.grid.types).translate(SAVE_TYPES)
+        self.observed = True
+
+    def finish(self, path):
+        self.path = array('i', path)
+
+    def save(self, path):
+        meta = json.dumps(self.meta).encode()
+        with open(path, 'wb') as f:
+            f.write(REC_HEADER.pack(REC_MAGIC, self.width, self.height, len(self), len(self.cells), len(self.path), len(meta)))
+            f.write(self.board)
+            for values in (self.offsets, self.cells, self.values):
+                write_array(f, values)
+            self.kinds.tofile(f)
+            write_array(f, self.path)
+            f.write(meta)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            header = f.read(REC_HEADER.size)
+            if len(header) != REC_HEADER.size or header[:len(REC_MAGIC)] != REC_MAGIC:
+                raise ValueError('{}: not a recording'.format(path))
+            _, width, height, steps, events, path_length, meta_length = REC_HEADER.unpack(header)
+            recording = cls.__new__(cls)
+            recording.width, recording.height, recording.size = width, height, width * height
+            recording.grid = None
+            try:
+                recording.board = f.read(width * height)
+                recording.offsets = read_array(f, 'i', steps + 1)
+                recording.cells = read_array(f, 'i', events)
+                recording.values = read_array(f, 'i', events)
+                recording.kinds = read_array(f, 'b', events)
+                recording.path = read_array(f, 'i', path_length)
+            except EOFError:
+                raise ValueError('{}: truncated recording'.format(path))
+            recording.meta = json.loads(f.read(meta_length).decode())
+        recording.keyframes = recording.keyframe_steps = recording.cell_events = None
+        recording.observed = True
+        return recording
+
+    def apply(self, types, step, end):
+        '''
+        step 단계 뒤의 셀 종류 배열 types 에 end 단계까지의 사건 적용, 바뀐 셀 인덱스 리스트 반환
+        '''
+        changed = []
+        cells, kinds = self.cells, self.kinds
+        for pos in range(self.offsets[step], self.offsets[end]):
+            code, side = divmod(kinds[pos], 2)
+            if code < 2 and types[cells[pos]] not in BOARD_TYPES:  # 꺼냄 / 넣음만 색이 바뀜 (벽 / 시작점 / 끝점 제외)
+                types[cells[pos]] = FRONTIER_TYPES[side][code]
+                changed.append(cells[pos])
+        return changed
+
+    def build_keyframes(self):
+        # 키프레임 사이 사건 수는 보드가 크면 셀 수의 1/4 까지 늘려 키프레임 메모리를 사건 기록과 비슷하게
+        interval = max(KEYFRAME_EVENTS, self.size // 4)
+        types = bytearray(self.board)
+        self.keyframes, self.keyframe_steps = [bytes(types)], [0]
+        last = 0
+        for step in range(1, len(self) + 1):
+            if self.offsets[step] - self.offsets[last] >= interval:
+                self.apply(types, last, step)
+                self.keyframes.append(bytes(types))
+                self.keyframe_steps.append(step)
+                last = step
+
+    def state(self, step):
+        '''
+        step 단계 뒤의 셀 종류 배열 (0 이면 탐색 전 보드)
+        '''
+        if self.keyframes is None:
+            self.build_keyframes()
+        num = bisect.bisect_right(self.keyframe_steps, step) - 1
+        types = bytearray(self.keyframes[num])
+        self.apply(types, self.keyframe_steps[num], step)
+        return types
+
+    def value(self, idx, step):
+        '''
+        step 단계 뒤 셀 idx 의 마지막 기록 값, 그때까지 사건이 없었으면 None
+        '''
+        if self.cell_events is None:
+            self.cell_events = {}
+            for pos, cell in enumerate(self.cells):
+                self.cell_events.setdefault(cell, []).append(pos)
+        positions = self.cell_events.get(idx, [])
+        num = bisect.bisect_left(positions, self.offsets[step]) - 1
+        return self.values[positions[num]] if num >= 0 else None
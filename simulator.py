@@ -3,39 +3,67 @@ import sys
 import time
 
 import algorithms
+import engine
+from cache import QueryCache
+from hpa import Hierarchy
+from instrument import Instrument
+from replay import Recording
+from connectivity import Connectivity
 from constants import *
+from grid import INF, SAVE_TYPES, Cell, Grid, open_grid, save_grid
+from viewport import Viewport
 
 pygame.init()
 pygame.display.set_caption('Pathfinding Simulation')
 
-
-class Cell(object):
-    def __init__(self, x_idx, y_idx):
-        self.pos = x_idx, y_idx  # 셀의 위치 값(튜플)
-        self.color = COLOR_WHITE  # 셀의 색깔 겸 시작점/끝점/벽/빈공간의 역할
-        self.prev = None  # # 이전 셀의 위치 값, 최단경로(Simulator.path) 계산할 때 사용
-
-    def __lt__(self, other):  # 힙정렬 시 에러 방지용 메서드
-        return False
-        
-    def __repr__(self):  # print 될 때 색 출력
-        return str(self.pos)
+# 마웃스 / 키 입력
+MOUSEBUTTONDOWN = pygame.MOUSEBUTTONDOWN
+MOUSEMOTION = pygame.MOUSEMOTION
+MOUSEBUTTONUP = pygame.MOUSEBUTTONUP
+KEYUP = pygame.KEYUP
+QUIT = pygame.QUIT
+K_ESCAPE = pygame.K_ESCAPE 
+K_SPACE = pygame.K_SPACE
+K_EQUALS = pygame.K_EQUALS
+K_MINUS = pygame.K_MINUS
+K_t = pygame.K_t
+K_f = pygame.K_f
+K_s = pygame.K_s
+K_l = pygame.K_l
+K_e = pygame.K_e
+K_i = pygame.K_i
+K_r = pygame.K_r
+K_w = pygame.K_w
+K_LEFT = pygame.K_LEFT
+K_RIGHT = pygame.K_RIGHT
+K_UP = pygame.K_UP
+K_DOWN = pygame.K_DOWN
+K_HOME = pygame.K_HOME
+K_END = pygame.K_END
+K_z = pygame.K_z
+LEFT_CLICK = (1, 0, 0)
+WHEEL_UP = 4
+WHEEL_DOWN = 5
+
+# 벽만 빈 공간으로 (bytes.translate 표, 탐색 표시는 SAVE_TYPES 로 지움)
+NO_WALLS = bytes(CELL_EMPTY if value == CELL_WALL else value for value in range(256))
 
 
 class Simulator(object):
     data_structure = None
 
-    def __init__(self):
+    def __init__(self, path=None):
+        '''
+        path 를 주면 그 지도 파일(.grid 또는 텍스트 지도) 의 크기 / 벽 / 시작점 / 끝점으로 시작
+        '''
         # 알고리즘 선택 가능 모드
-        self.modes = ['BFS', 'A*', 'Dijkstra']
+        self.modes = list(engine.ALGORITHMS)
         self.mode = DEFAULT_MODE
 
-        # 보드 크기
+        # 보드 화면 크기 (보드가 더 크면 확대 / 이동해서 봄)
         self.cell_size = CELL_SIZE
-        self.width_cnt = WIDTH_CNT
-        self.height_cnt = HEIGHT_CNT
-        self.width_board = self.cell_size * self.width_cnt
-        self.height_board = self.cell_size * self.height_cnt
+        self.width_board = self.cell_size * WIDTH_CNT
+        self.height_board = self.cell_size * HEIGHT_CNT
 
         # 패널 크기
         self.width_panel = WIDTH_PANEL
@@ -49,21 +77,19 @@ class Simulator(object):
         self.height = self.height_board
         self.screen = pygame.display.set_mode((self.width, self.height))
 
-        # 셀 초기화
-        self.cells_plane = [[Cell(x_idx, y_idx) for x_idx in range(self.width_cnt)] for y_idx in range(self.height_cnt)]
-        self.cells_flatten = [cell for column in self.cells_plane for cell in column]  # 인덱스 상관없이 모든 요소 순환할 때 요긴함
-
         # 변수 초기화
-        self.path = list()
-        self.start_cell = self.cells_plane[1 - 1][1 - 1]
-        self.end_cell = self.cells_plane[self.width_cnt - 1][self.height_cnt - 1]
+        self.path = list()  # 찾은 경로의 셀 위치 리스트
         self.delta = WITHOUT_DIAGONAL
         # self.delta = WITH_DIAGONAL
         self.status = 'wait'
-        self.prev_cells = set()
-        self.next_cells = set()
+        self.no_path = False
         self.debug_list = list()
 
+        # 프레임마다 알고리즘 실행량
+        self.steps_per_frame = STEPS_PER_FRAME
+        self.time_budget = None  # 초 단위, 정하면 단계 수 대신 사용
+        self.finish = False  # 끝날 때까지 중간 화면 그리기 생략
+
         # 시간
         self.clock = pygame.time.Clock()
         self.start_time = 0.
@@ -73,6 +99,148 @@ class Simulator(object):
         # 마우스 / 키 입력
         self.dragging = None
 
+        # 화면 (바뀐 셀이 걸친 영역과 덧그림 영역만 다시 그림)
+        self.dirty_cells = set()  # 다음 프레임에 다시 칠할 셀 인덱스
+        self.redraw_all = True  # 화면 전체 다시 그리기
+        self.overlay_rects = list()  # 지난 프레임에 셀 위에 덧그린 디버그 글자 영역
+        self.panel_key = None  # 지난 프레임에 그린 패널 상태
+        self.path_drawn = False
+        self.fonts = {size: pygame.font.Font(PATH_FONT, size) for size in (15, 20)}
+
+        # 계측 (단계 / 프레임 시간, 패널에 최근 평균 표시)
+        self.instrument = Instrument()
+        self.trace_steps = False  # I 키로 켜면 다음 실행부터 단계마다 추적 기록 (E 키로 저장)
+        self.hud_lines = list()  # 패널에 표시 중인 계측 값
+        self.hud_time = 0.  # 계측 값을 마지막으로 갱신한 시각
+
+        # 흐름장 모드가 끝나면 빈 공간을 끝점까지 거리 히트맵으로 칠함
+        self.heatmap = None  # 셀마다 색 단계 (닿을 수 없는 셀은 -1)
+        (near_r, near_g, near_b), (far_r, far_g, far_b) = HEAT_COLORS
+        self.heat_palette = [(near_r + (far_r - near_r) * level // (HEAT_LEVELS - 1),
+                              near_g + (far_g - near_g) * level // (HEAT_LEVELS - 1),
+                              near_b + (far_b - near_b) * level // (HEAT_LEVELS - 1)) for level in range(HEAT_LEVELS)]
+        self.mode_labels = {mode: self.fonts[20].render(mode, True, COLOR_BLACK) for mode in self.modes}
+        self.debug_key = None
+        self.debug_surfaces = list()
+
+        # 셀 / 보드에서 만든 인덱스 초기화
+        self.new_board(WIDTH_CNT, HEIGHT_CNT)
+        self.cached = None  # 이번 질의에 캐시가 답한 결과
+        self.searched = False  # 이번 질의를 실제로 탐색했는지
+
+        # 탐색 기록 (완료 후 R 키로 다시 보기, W 키로 저장)
+        self.recording = None
+        self.replay_pos = 0  # 다시 보기 중인 단계 (이 단계까지의 사건을 적용한 보드)
+        self.replay_playing = False
+
+        if path is not None:
+            board = engine.as_grid(engine.load_board(path))
+            self.new_board(board.width, board.height, board.types)
+
+    def new_board(self, width_cnt, height_cnt, types=None):
+        '''
+        width_cnt x height_cnt 보드(types 를 주면 그 벽 / 시작점 / 끝점, 아니면 빈 보드)와
+        보드에서 만드는 인덱스 / 화면 새로 만들기
+        '''
+        self.width_cnt = width_cnt
+        self.height_cnt = height_cnt
+        self.grid = Grid(self.width_cnt, self.height_cnt)  # 셀 상태는 배열에 저장, 셀은 배열을 가리키는 뷰
+        if types is not None:
+            self.grid.types[:] = bytes(types).translate(SAVE_TYPES)
+
+        # 보드에 시작점 / 끝점이 없으면 양 끝 모서리 (벽 위면 벽은 없어짐)
+        start_idx, end_idx = self.grid.types.find(CELL_START), self.grid.types.find(CELL_END)
+        self.start_cell = Cell(self.grid, start_idx) if start_idx >= 0 else self.cell(0, 0)
+        self.end_cell = Cell(self.grid, end_idx) if end_idx >= 0 else self.cell(self.width_cnt - 1, self.height_cnt - 1)
+        for cell in (self.start_cell, self.end_cell):
+            if cell.type == CELL_WALL:
+                cell.type = CELL_EMPTY
+
+        # 보이는 부분만 그리는 보드 화면 (처음에는 보드 전체가 들어오게)
+        self.view = Viewport(self.grid, pygame.Rect(0, 0, self.width_board, self.height_board))
+
+        # 연결 요소 인덱스 (처음 질의할 때 만들고, 벽을 고칠 때마다 갱신)
+        walkable = algorithms.walkable_func(self.grid)
+        self.connectivity = Connectivity(self.width_cnt, self.height_cnt, walkable, self.delta, self.grid.types)
+
+        # HPA* 추상 그래프 (처음 쓸 때 만들고, 벽을 고칠 때마다 바뀐 클러스터만 갱신)
+        self.hierarchy = None
+
+        # JPS+ 점프 테이블 (처음 쓸 때 만들고, 벽을 고치면 다시 만듦)
+        self.jump_table = None
+
+        # 흐름장 (끝점 / 벽이 그대로면 다음 실행에서 다시 계산하지 않음, 벽을 고치면 버림)
+        self.flow_field = None
+
+        # D* Lite 탐색 값 (완료 후 보드를 고치면 이어서 다시 탐색)
+        self.planner = None
+
+        # 질의 결과 캐시 (같은 보드에서 답해둔 질의는 탐색 없이 경로만 표시)
+        self.cache = QueryCache(self.grid)
+
+        self.heatmap = None
+        self.dirty_cells.clear()
+        self.redraw_all = True
+
+    def cell(self, x_idx, y_idx):
+        return Cell(self.grid, self.grid.index(x_idx, y_idx))
+
+    def cell_at(self, x, y):
+        '''
+        화면 (x, y) 의 셀 (보드 밖이면 None)
+        '''
+        pos = self.view.cell_at(x, y)
+        return self.cell(*pos) if pos is not None else None
+
+    def clear_search(self):
+        '''
+        탐색 표시(열린 / 닫힌 셀) 지우기
+        '''
+        self.grid.types[:] = bytes(self.grid.types).translate(SAVE_TYPES)
+        self.redraw_all = True
+
+    def set_wall(self, cell, wall):
+        '''
+        빈 공간을 벽으로, 또는 벽을 빈 공간으로 바꾸고 연결 요소 인덱스 갱신
+        실제로 바뀌었으면 True
+        '''
+        if wall and (cell.type == CELL_EMPTY or cell.type in SEARCH_TYPES):  # 탐색 표시가 남은 칸도 빈 공간
+            cell.type = CELL_WALL
+            self.connectivity.add_wall(*cell.pos)
+        elif not wall and cell.type == CELL_WALL:
+            cell.type = CELL_EMPTY
+            self.connectivity.remove_wall(*cell.pos)
+        else:
+            return
+        if self.hierarchy is not None:
+            self.hierarchy.update(*cell.pos)
+        self.jump_table = None
+        self.flow_field = None
+        if self.planner is not None:
+            self.planner.update_cell(cell.idx)
+        self.cache.update(*cell.pos)
+        self.dirty_cells.add(cell.idx)
+        return True
+
+
+    def save_board(self, path):
+        '''
+        벽 / 시작점 / 끝점을 .grid 파일로 저장
+        '''
+        save_grid(self.grid, path)
+        print('Saved: {}'.format(path))
+
+    def load_board(self, path):
+        '''
+        .grid 파일의 벽 / 시작점 / 끝점 불러오기 (보드 크기가 다르면 그 크기로)
+        '''
+        try:
+            board = open_grid(path)
+        except (OSError, ValueError) as error:
+            print('Load failed: {}'.format(error))
+            return
+        self.new_board(board.width, board.height, board.types)
+        print('Loaded: {}'.format(path))
 
     def handle_event(self):
         '''
@@ -98,67 +266,166 @@ class Simulator(object):
                     self.status = 'run'
                 elif self.status == 'complete':  # 실행 후 - 대기상태 및 초기화
                     self.status = 'wait'
-                    for cell in self.cells_flatten:
-                        if cell.color in {COLOR_LIGHT_GREEN, COLOR_LIGHT_BLUE}:
-                            cell.color = COLOR_WHITE
-                            cell.trace = list()
-                            cell.prev = None
+                    self.no_path = False
+                    self.clear_search()
                     self.path.clear()
                     self.debug_list.clear()
+                elif self.status == 'replay':  # 다시 보기 재생 / 멈춤 (끝에서는 처음부터)
+                    if self.replay_pos == len(self.recording):
+                        self.seek(0)
+                    self.replay_playing = not self.replay_playing
+
+            # 실행 속도 설정: +/- 단계 수, T 시간 예산, F 끝까지 실행
+            elif e_type == KEYUP and e_dict['key'] in {K_EQUALS, K_MINUS, K_t, K_f}:
+                key = e_dict['key']
+                if key == K_EQUALS:
+                    self.steps_per_frame *= 2
+                elif key == K_MINUS:
+                    self.steps_per_frame = max(self.steps_per_frame // 2, 1)
+                elif key == K_t:
+                    self.time_budget = None if self.time_budget else FRAME_BUDGET
+                elif key == K_f:
+                    self.finish = not self.finish
+                print('Speed: {}'.format(self.speed_label()))
 
             # 대기상태 일 때 ESC
             elif self.status == 'wait' and e_type == KEYUP and e_dict['key'] == K_ESCAPE:
-                for cell in self.cells_flatten:
-                    if cell.color == COLOR_GRAY:  # 벽 없애기
-                        cell.color = COLOR_WHITE
+                self.grid.types[:] = bytes(self.grid.types).translate(NO_WALLS)  # 벽 없애기
+                self.connectivity.rebuild()
+                self.hierarchy = None
+                self.jump_table = None
+                self.flow_field = None
+                self.planner = None
+                self.cache.clear()
+                self.redraw_all = True
+
+            # I: 단계별 추적 기록 켜기 / 끄기 (다음 실행부터)
+            elif e_type == KEYUP and e_dict['key'] == K_i:
+                self.trace_steps = not self.trace_steps
+                print('Step trace: {}'.format('on' if self.trace_steps else 'off'))
+
+            # 완료됐을 때 E: 마지막 실행의 계측 추적 저장
+            elif self.status == 'complete' and e_type == KEYUP and e_dict['key'] == K_e:
+                if not self.instrument.tracing:
+                    print('No trace (press I before running)')
+                else:
+                    self.instrument.save(PATH_TRACE)
+                    print('Trace: {}'.format(PATH_TRACE))
+
+            # 완료됐을 때 W / R: 마지막 탐색 기록 저장 / 다시 보기
+            elif self.status == 'complete' and e_type == KEYUP and e_dict['key'] in {K_w, K_r}:
+                if self.recording is None:  # 캐시가 답했거나 이어지지 않아 탐색하지 않음
+                    print('No recording')
+                elif e_dict['key'] == K_w:
+                    self.recording.save(PATH_RECORDING)
+                    print('Recording: {}'.format(PATH_RECORDING))
+                else:
+                    self.start_replay(self.recording)
+
+            # 대기상태 일 때 R: 저장한 탐색 기록 불러와 다시 보기
+            elif self.status == 'wait' and e_type == KEYUP and e_dict['key'] == K_r:
+                self.load_recording(PATH_RECORDING)
+
+            # 다시 보는 중: 좌우 한 단계, 위아래 전체의 10%, Home / End 처음 / 끝, R / ESC 끝내기
+            elif self.status == 'replay' and e_type == KEYUP and e_dict['key'] in {K_LEFT, K_RIGHT, K_UP, K_DOWN, K_HOME, K_END, K_r, K_ESCAPE}:
+                key = e_dict['key']
+                jump = max(len(self.recording) // 10, 1)
+                if key in (K_r, K_ESCAPE):
+                    self.end_replay()
+                    continue
+                self.replay_playing = False
+                if key == K_LEFT:
+                    self.seek(self.replay_pos - 1)
+                elif key == K_RIGHT:
+                    self.seek(self.replay_pos + 1)
+                elif key == K_DOWN:
+                    self.seek(self.replay_pos - jump)
+                elif key == K_UP:
+                    self.seek(self.replay_pos + jump)
+                elif key == K_HOME:
+                    self.seek(0)
+                elif key == K_END:
+                    self.seek(len(self.recording))
+
+            # 대기상태 일 때 S / L: 보드 저장 / 불러오기
+            elif self.status == 'wait' and e_type == KEYUP and e_dict['key'] in {K_s, K_l}:
+                if e_dict['key'] == K_s:
+                    self.save_board(PATH_BOARD)
+                else:
+                    self.load_board(PATH_BOARD)
             
-            # 대기상태 일 때 마우스 입력
-            elif self.status == 'wait' and e_type in {MOUSEBUTTONDOWN, MOUSEMOTION, MOUSEBUTTONUP}:
+            # 보드 위 휠: 마우스 자리를 중심으로 확대 / 축소 (어느 상태에서나)
+            elif e_type == MOUSEBUTTONDOWN and e_dict['button'] in (WHEEL_UP, WHEEL_DOWN) and e_dict['pos'][0] < self.width_board:
+                self.view.zoom(1 if e_dict['button'] == WHEEL_UP else -1, *e_dict['pos'])
+                self.redraw_all = True
+
+            # 보드 위 우클릭 드래그: 화면 이동
+            elif e_type == MOUSEMOTION and e_dict['buttons'][2] and e_dict['pos'][0] < self.width_board:
+                self.view.pan(*e_dict['rel'])
+                self.redraw_all = True
+
+            # Z: 보드 전체가 들어오게
+            elif e_type == KEYUP and e_dict['key'] == K_z:
+                self.view.fit()
+                self.redraw_all = True
+
+            # 좌클릭 해제: 상태와 상관없이 드래그 끝 (D* Lite 가 다시 탐색하는 중에 놓아도)
+            elif e_type == MOUSEBUTTONUP and e_dict['button'] == 1:
+                self.dragging = None
+
+            # 대기상태 (또는 D* Lite 완료 후 보드 편집) 일 때 마우스 입력
+            elif e_type in {MOUSEBUTTONDOWN, MOUSEMOTION, MOUSEBUTTONUP} and (self.status == 'wait' or self.live_edit(e_type, e_dict)):
                 x, y = e_dict['pos']
-                x_idx, y_idx = x // self.cell_size, y // self.cell_size
 
-                # 마우스가 보드 안
+                # 마우스가 보드 화면 안
                 if x < self.width_board:
-                    cell = self.cells_plane[y_idx][x_idx]
+                    cell = self.cell_at(x, y)  # 축소해서 보드 밖 빈 곳이면 None
+                    changed = False
 
                     # 마우스 좌클릭
-                    if e_type == MOUSEBUTTONDOWN and e_dict['button'] == 1:
+                    if e_type == MOUSEBUTTONDOWN and e_dict['button'] == 1 and cell is not None:
 
                         # 클릭 / 드래그 동안의 상태 self.dragging에 저장
                         if not self.dragging: 
-                            if cell.color == COLOR_WHITE:
+                            if cell.type == CELL_EMPTY or cell.type in SEARCH_TYPES:
                                 self.dragging = 'create wall'
-                            elif cell.color == COLOR_GRAY:
+                            elif cell.type == CELL_WALL:
                                 self.dragging = 'remove wall'
-                            elif cell.color == COLOR_GREEN:
+                            elif cell.type == CELL_START:
                                 self.dragging = 'move start'
-                            elif cell.color == COLOR_RED:
+                            elif cell.type == CELL_END:
                                 self.dragging = 'move end'
 
                         # 벽 / 빈 공간 클릭 시 토글
                         if self.dragging == 'create wall':
-                            cell.color = COLOR_GRAY
+                            changed = self.set_wall(cell, True)
                         elif self.dragging == 'remove wall':
-                            cell.color = COLOR_WHITE
+                            changed = self.set_wall(cell, False)
 
                     # 마우스 드래그(좌클릭)
-                    elif e_type == MOUSEMOTION and e_dict['buttons'] == LEFT_CLICK:
+                    elif e_type == MOUSEMOTION and e_dict['buttons'] == LEFT_CLICK and cell is not None:
                         # 벽 / 빈 공간 드래그 시 토글
                         if self.dragging == 'create wall':
-                            cell.color = COLOR_GRAY
+                            changed = self.set_wall(cell, True)
                         elif self.dragging == 'remove wall':
-                            cell.color = COLOR_WHITE
-                        # 시작점 / 끝 점 드래그 시 이동
-                        elif self.dragging == 'move start':
-                            self.start_cell.color = COLOR_WHITE
-                            self.start_cell = self.cells_plane[y_idx][x_idx]
-                        elif self.dragging == 'move end':
-                            self.end_cell.color = COLOR_WHITE
-                            self.end_cell = self.cells_plane[y_idx][x_idx]
-
-                    # 마우스 좌클릭 해체
-                    elif e_type == MOUSEBUTTONUP:
-                        self.dragging = None
+                            changed = self.set_wall(cell, False)
+                        # 시작점 / 끝 점 드래그 시 이동 (벽 위로 옮기면 벽은 없어짐)
+                        elif self.dragging == 'move start' and cell not in (self.start_cell, self.end_cell):
+                            self.start_cell.type = CELL_EMPTY
+                            self.dirty_cells.add(self.start_cell.idx)
+                            self.set_wall(cell, False)
+                            self.start_cell = cell
+                            changed = True
+                        elif self.dragging == 'move end' and cell not in (self.start_cell, self.end_cell):
+                            self.end_cell.type = CELL_EMPTY
+                            self.dirty_cells.add(self.end_cell.idx)
+                            self.set_wall(cell, False)
+                            self.end_cell = cell
+                            changed = True
+
+                    # D* Lite 완료 후 고쳤으면 이전 탐색 값으로 바로 다시 탐색
+                    if changed and self.status == 'complete':
+                        self.replan()
 
                 # 마우스가 패널 안
                 elif x >= self.width_board:
@@ -176,102 +443,260 @@ class Simulator(object):
                                 self.mode = mode  # 모드 설정
                                 print('Mode: {}'.format(mode))
 
-            # 일시정지 중이거나 완료됐을 때
-            elif self.status in ('pause', 'complete') and e_type in {MOUSEBUTTONDOWN, MOUSEMOTION, MOUSEBUTTONUP}:
+            # 일시정지 중이거나 완료됐거나 다시 보는 중일 때
+            elif self.status in ('pause', 'complete', 'replay') and e_type in {MOUSEBUTTONDOWN, MOUSEMOTION, MOUSEBUTTONUP}:
                 x, y = e_dict['pos']
-                x_idx, y_idx = x // self.cell_size, y // self.cell_size
+                cell = self.cell_at(x, y)
                 self.debug_list.clear()
 
-                # 마우스가 보드 안
-                if x < self.width_board:
-                    cell = self.cells_plane[y_idx][x_idx]
+                # 마우스가 보드 위
+                if cell is not None:
 
                     # 디버그 정보 추가
-                    if self.mode == 'BFS':
+                    if self.status == 'replay':  # 다시 보는 단계의 기록 값
+                        self.debug_list.extend(self.replay_debug(x, y, cell))
+                    elif self.mode == 'BFS':
                         self.debug_list.append(((x, y), 'pos', cell.pos))
                         self.debug_list.append(((x, y), 'prev', cell.prev))
-                    elif self.mode == 'A*':
+                    elif self.mode in ('A*', 'JPS', 'JPS+', 'HPA*'):
+                        (cell_x, cell_y), (end_x, end_y) = cell.pos, self.end_cell.pos
+                        h = algorithms.heuristic_func(self.delta)(abs(cell_x - end_x), abs(cell_y - end_y))
                         self.debug_list.append(((x, y), 'pos', cell.pos))
                         self.debug_list.append(((x, y), 'prev', cell.prev))
-                        self.debug_list.append(((x, y), 'F', cell.f))
+                        self.debug_list.append(((x, y), 'F', cell.g + h))
                         self.debug_list.append(((x, y), 'G', cell.g))
-                        self.debug_list.append(((x, y), 'H', cell.h))
+                        self.debug_list.append(((x, y), 'H', h))
                     elif self.mode == 'Dijkstra':
                         self.debug_list.append(((x, y), 'pos', cell.pos))
                         self.debug_list.append(((x, y), 'prev', cell.prev))
-                        self.debug_list.append(((x, y), 'dist', cell.dist))
+                        self.debug_list.append(((x, y), 'dist', cell.g))
+                    elif self.mode == 'Flow field' and self.heatmap is not None:
+                        dist, next_idx = self.data.distance(cell.idx), int(self.data.next[cell.idx])
+                        self.debug_list.append(((x, y), 'pos', cell.pos))
+                        self.debug_list.append(((x, y), 'dist', float('inf') if dist == INF else dist))
+                        self.debug_list.append(((x, y), 'next', self.grid.pos(next_idx) if next_idx >= 0 else None))
+                    elif self.mode == 'D* Lite' and self.planner is not None:
+                        self.debug_list.append(((x, y), 'pos', cell.pos))
+                        self.debug_list.append(((x, y), 'prev', cell.prev))
+                        self.debug_list.append(((x, y), 'G(end)', self.planner.g[cell.idx]))
+                        self.debug_list.append(((x, y), 'RHS', self.planner.rhs[cell.idx]))
+                    elif self.mode in ('Bi-BFS', 'Bi-Dijkstra', 'Bi-A*'):
+                        self.debug_list.append(((x, y), 'pos', cell.pos))
+                        self.debug_list.append(((x, y), 'prev', cell.prev))
+                        self.debug_list.append(((x, y), 'next', cell.next))
+                        self.debug_list.append(((x, y), 'G', cell.g))
+                        self.debug_list.append(((x, y), 'G(back)', cell.g_back))
 
             # 실행 중일 때 ESC
             elif self.status == 'run' and e_type == KEYUP and e_dict['key'] == K_ESCAPE:
                 # 대기 중 상태로 전환 및 초기화
                 self.status = 'wait'
-                for cell in self.cells_flatten:
-                    if cell.color in {COLOR_LIGHT_GREEN, COLOR_LIGHT_BLUE}:
-                        cell.color = COLOR_WHITE
-                        cell.trace = list()
+                self.clear_search()
                 self.path.clear()
                 self.debug_list.clear()
 
-    def ready(self):
+    def load_recording(self, path):
         '''
-        알고리즘 실행 전 설정
+        저장한 탐색 기록의 보드 / 모드 / 경로를 불러와 다시 보기 (보드 크기가 다르면 그 크기로)
+        '''
+        try:
+            recording = Recording.load(path)
+        except (OSError, ValueError) as error:
+            print('Load failed: {}'.format(error))
+            return
+
+        self.new_board(recording.width, recording.height, recording.board)
+        if recording.meta.get('mode') in self.modes:
+            self.mode = recording.meta['mode']
+        algorithms.trace_path(self.grid, list(recording.path))  # 완료 후 디버그 정보는 경로 위 값만
+        self.path = [self.grid.pos(idx) for idx in recording.path]
+        self.no_path = not self.path
+        print('Loaded: {}'.format(path))
+        self.start_replay(recording)
+
+    def start_replay(self, recording):
+        '''
+        탐색 기록을 처음부터 다시 보기 시작
+        '''
+        self.recording = recording
+        self.grid.types[:] = recording.state(0)
+        self.replay_pos = 0
+        self.replay_playing = True
+        self.debug_list.clear()
+        self.redraw_all = True
+        self.status = 'replay'
+
+    def end_replay(self):
+        '''
+        다시 보기 끝: 마지막 단계의 보드로 완료 상태
+        '''
+        self.seek(len(self.recording))
+        self.replay_playing = False
+        self.debug_list.clear()
+        self.redraw_all = True
+        self.status = 'complete'
+
+    def seek(self, step):
         '''
-        args = self.cells_plane, self.start_cell, self.end_cell, self.delta
+        다시 보기를 step 단계로 옮김 (조금 앞이면 그 사이 사건만, 아니면 가장 가까운 키프레임에서)
+        '''
+        recording = self.recording
+        step = min(max(step, 0), len(recording))
+        if self.replay_pos <= step and recording.offsets[step] - recording.offsets[self.replay_pos] <= KEYFRAME_EVENTS:
+            self.dirty_cells.update(recording.apply(self.grid.types, self.replay_pos, step))
+        else:
+            self.grid.types[:] = recording.state(step)
+            self.redraw_all = True
+        self.replay_pos = step
 
-        if self.mode == 'BFS':
-            init_func = algorithms.BFS_init
-        elif self.mode == 'A*':
-            init_func = algorithms.Astar_init
-        elif self.mode == 'Dijkstra':
-            init_func = algorithms.dijkstra_init
+        # 마우스가 가리키는 셀의 값도 이 단계로
+        if self.debug_list:
+            x, y = self.debug_list[0][0]
+            cell = self.cell_at(x, y)
+            self.debug_list[:] = self.replay_debug(x, y, cell) if cell is not None else []
 
-        self.data, self.func = init_func(*args)
-        self.status = 'run'
+    def replay(self):
+        '''
+        한 프레임 동안 다시 보기 진행 (단계 수만큼, 끝까지 실행 모드면 바로 끝으로)
+        '''
+        if not self.replay_playing:
+            return
+        self.seek(len(self.recording) if self.finish else self.replay_pos + self.steps_per_frame)
+        if self.replay_pos == len(self.recording):
+            self.replay_playing = False
+
+    def replay_debug(self, x, y, cell):
+        '''
+        다시 보는 단계까지 셀을 마지막으로 꺼내거나 넣었을 때의 g (양방향 탐색의 역방향은 g_back)
+        '''
+        value = self.recording.value(cell.idx, self.replay_pos)
+        return [((x, y), 'pos', cell.pos),
+                ((x, y), 'G', float('inf') if value == INF else value),
+                ((x, y), 'step', self.replay_pos)]
+
+    def live_edit(self, e_type, e_dict):
+        '''
+        D* Lite 완료 후 보드 위 좌클릭 / 드래그인지 (벽 / 시작점 / 끝점을 고치면 바로 다시 탐색)
+        '''
+        if self.status != 'complete' or self.mode != 'D* Lite' or e_dict['pos'][0] >= self.width_board:
+            return False
+        if e_type == MOUSEBUTTONDOWN:
+            return e_dict['button'] == 1
+        return e_type == MOUSEMOTION and e_dict['buttons'] == LEFT_CLICK
+
+    def replan(self):
+        '''
+        탐색 표시를 지우고 다시 준비상태로 (D* Lite 는 바뀐 부분만 다시 확장)
+        '''
+        self.clear_search()
+        self.path.clear()
+        self.no_path = False
+        self.debug_list.clear()
+        self.status = 'ready'
+
+    def ready(self):
+        '''
+        알고리즘 실행 전 설정
+        '''
         self.start_time = time.time()  # 시간 측정 시작
+        self.searched = False
+        self.recording = None
+        self.heatmap = None
+
+        # 시작점과 끝점이 이어지지 않았으면 탐색 없이 실패
+        if not self.connectivity.connected(self.start_cell.pos, self.end_cell.pos):
+            self.grid.reset()
+            self.path = []
+            self.cached = None
+            self.status = 'complete'
+            return
+
+        # 같은 보드에서 답해둔 질의면 탐색 없이 경로만 기록
+        self.cached = self.cache.get(self.mode, self.delta, self.start_cell.pos, self.end_cell.pos)
+        if self.cached is not None:
+            algorithms.trace_path(self.grid, [self.grid.index(*pos) for pos in self.cached.path])
+            self.status = 'complete'
+            return
+
+        args = self.grid, self.start_cell.idx, self.end_cell.idx, self.delta
+
+        init_func = engine.ALGORITHMS[self.mode]
+        options = {}
+        if self.mode == 'HPA*':
+            if self.hierarchy is None:
+                self.hierarchy = Hierarchy(self.grid, self.delta)
+            options['hierarchy'] = self.hierarchy
+        elif self.mode == 'JPS+':
+            if self.jump_table is None:
+                self.jump_table = algorithms.build_jump_table(self.grid, self.delta)
+            options['jump_table'] = self.jump_table
+        elif self.mode == 'D* Lite':
+            options['planner'] = self.planner
+        elif self.mode == 'Flow field':
+            options['field'] = self.flow_field
+
+        self.data, self.func = init_func(*args, **options)
+        if self.mode == 'D* Lite':
+            self.planner = self.data
+        elif self.mode == 'Flow field':
+            self.flow_field = self.data
+        self.searched = True
+        self.recording = Recording(self.grid, mode=self.mode, diagonal=len(self.delta) > 4)
+        self.instrument.begin(self.data, self.trace_steps, mode=self.mode, width=self.width_cnt, height=self.height_cnt,
+                              diagonal=len(self.delta) > 4, start=self.start_cell.pos, end=self.end_cell.pos)
+        self.status = 'run'
 
     def run(self):
         '''
         알고리즘 실행
         '''
-        # 알고리즘 함수의 자료구조에서 Cell 인스턴스 찾기
-        # 자료구조 요소가 iterable 이면 Cell 인스턴스가 있는 인덱스 찾기
-        if hasattr(self.data[0], '__iter__'):
-            for idx, element in enumerate(self.data[0]):
-                if isinstance(element, Cell):
-                    break
-        # 자료구조 요소가 iterable이 아니면 idx를 None으로 초기화
-        else:
-            idx = None
-
-        # prev_cells 에 함수 실행 전 자료구조 상태 저장
-        # next_cells 에 함수 실행 후 자료구조 상태 저장
-        if idx is None:
-            self.prev_cells = set(self.data)
-            status = self.func()
-            self.next_cells = set(self.data)
-        else:
-            self.prev_cells = {data[idx] for data in self.data}
-            status = self.func()
-            self.next_cells = {data[idx] for data in self.data}
-
-        # 자료구조에서 제거된(확인된) cell 은 파란 색으로 색칠
-        for cell in self.prev_cells - self.next_cells:
-            cell.color = COLOR_LIGHT_BLUE
-        # 자료구조에 추가된(확인할) cell 은 초록 색으로 색칠
-        for cell in self.next_cells - self.prev_cells:
-            cell.color = COLOR_LIGHT_GREEN
-        self.prev_cells = self.next_cells
+        status = self.instrument.step(self.data, self.func)
+        self.recording.add(self.func.events)
+
+        # 알고리즘이 보고한 사건만 화면에 반영 (양방향 탐색의 역방향은 side 1)
+        types = self.grid.types
+        for event, idx, side in self.func.events:
+            if types[idx] in BOARD_TYPES:  # 벽 / 시작점 / 끝점은 그대로
+                continue
+            closed_type, open_type = FRONTIER_TYPES[side]
+            # 자료구조에서 제거된(확인된) cell 은 파란 색(역방향은 분홍 색)으로 색칠
+            if event == EVENT_POP:
+                types[idx] = closed_type
+                self.dirty_cells.add(idx)
+            # 자료구조에 추가된(확인할) cell 은 초록 색(역방향은 연분홍 색)으로 색칠
+            elif event == EVENT_PUSH:
+                types[idx] = open_type
+                self.dirty_cells.add(idx)
 
         # 상태 업데이트
         if status:
             self.status = status
 
-        # 최단 경로 계산
-        self.path = []
-        target = self.end_cell
-        while target:
-            self.path.append(target.pos)
-            target = target.prev
+    def step(self):
+        '''
+        한 프레임 동안 알고리즘 실행 (단계 수 / 시간 예산 / 끝까지)
+        '''
+        if self.finish:
+            budget = FINISH_SLICE
+        elif self.time_budget:
+            budget = self.time_budget
+        else:
+            for _ in range(self.steps_per_frame):
+                self.run()
+                if self.status != 'run':
+                    break
+            return
+
+        deadline = time.perf_counter() + budget
+        while self.status == 'run' and time.perf_counter() < deadline:
+            self.run()
+
+    def speed_label(self):
+        if self.finish:
+            return 'finish'
+        if self.time_budget:
+            return '{:g} ms/frame'.format(self.time_budget * 1000)
+        return 'x{}'.format(self.steps_per_frame)
 
     def complete(self):
         '''
@@ -283,38 +708,50 @@ class Simulator(object):
             self.start_time = 0.
             self.end_time = 0.
 
-            # self.path의 인덱스 값을 실제 픽셀단위 위치로 변환
-            idx_to_len = lambda idx: self.cell_size * idx + self.cell_size // 2
-            self.path = [tuple(map(idx_to_len, (idx_x, idx_y))) for idx_x, idx_y in self.path]
-
-            self.prev_cells, self.next_cells = {}, {}
+            # 최단 경로 계산 (완료됐을 때 한 번만)
+            self.path = self.grid.path(self.end_cell.idx)
+
+            # 끝점까지 이어진 경로가 없으면 실패
+            self.no_path = not self.path
+            if self.no_path:
+                print('No path')
+            elif self.cached is not None:
+                print('Cached: no search')
+            elif self.mode == 'D* Lite':  # 이어서 탐색한 확장 수와 처음부터 탐색했을 때 비교
+                print('Expanded: {} (fresh search: {})'.format(self.planner.expansions, self.planner.fresh_expansions()))
+
+            # 계측 / 탐색 기록 끝 (E 키로 추적 저장, W / R 키로 탐색 기록 저장 / 다시 보기)
+            if self.searched:
+                self.instrument.finish(cost=algorithms.path_cost(self.path) if self.path else None, length=len(self.path))
+                self.recording.finish([self.grid.index(*pos) for pos in self.path])
+
+            # 흐름장은 거리 히트맵으로 다시 칠하기
+            if self.searched and self.mode == 'Flow field':
+                self.heatmap = self.data.heat_levels(HEAT_LEVELS)
+                self.redraw_all = True
+
+            # 탐색한 결과는 캐시에 저장 (다익스트라 / BFS 는 탐색 트리도)
+            if self.searched:
+                result = engine.Result(list(self.path), algorithms.path_cost(self.path) if self.path else None, 0)
+                self.cache.put(self.mode, self.delta, self.start_cell.pos, self.end_cell.pos, result)
+            self.path_drawn = False
+
+    def render_board(self, area=None):
+        '''
+        보드 화면의 area 영역 칠하기 (흐름장 모드가 끝났으면 벽 / 시작점 / 끝점 외에는 히트맵 색)
+        '''
+        marks = ((self.start_cell.pos, COLOR_GREEN), (self.end_cell.pos, COLOR_RED))
+        if self.heatmap is not None and self.status == 'complete':
+            return self.view.render(self.screen, area, self.heatmap, self.heat_palette, marks)
+        return self.view.render(self.screen, area, marks=marks)
 
-    def draw(self):
+    def draw_panel(self):
         '''
-        화면에 띄우기
+        알고리즘 선택버튼 상자 칠하기 / 텍스트 설정
         '''
-        # 시작점 / 끝점 칠하기
-        self.start_cell.color = COLOR_GREEN
-        self.end_cell.color = COLOR_RED
-
-        # 배경 칠하기
-        self.screen.fill(COLOR_BLACK)
-
-        # 각 셀들 흰 색으로 칠하기
-        rect_size = self.cell_size - 1
-        for y_idx, row in enumerate(self.cells_plane):
-            for x_idx, cell in enumerate(row):
-                rect_pos = tuple(self.cell_size * idx for idx in (x_idx, y_idx))
-                rect = pygame.Rect(*rect_pos, rect_size, rect_size) 
-                pygame.draw.rect(self.screen, cell.color, rect)
-
-        # 최단 경로선 칠하기
-        if self.status == 'complete':
-            if self.path and len(self.path) > 1:
-                pygame.draw.lines(self.screen, COLOR_YELLOW, False, self.path, 2)
-
-        # 알고리즘 선택버튼 상자 칠하기 / 텍스트 설정
-        font = pygame.font.Font(PATH_FONT, 20)
+        panel_rect = pygame.Rect(self.width_board, 0, self.width_panel, self.height)
+        self.screen.fill(COLOR_BLACK, panel_rect)
+
         for num, mode in enumerate(self.modes):
             # 상자 칠하기
             rect_left = self.width_board + self.margin_panel
@@ -324,50 +761,160 @@ class Simulator(object):
             if mode == self.mode:
                 pygame.draw.rect(self.screen, COLOR_ORANGE, rect, 2)
 
-            # 텍스트 설정
-            font_surface = font.render(mode, True, COLOR_BLACK)
+            # 텍스트 설정 (미리 렌더링한 글자)
+            font_surface = self.mode_labels[mode]
             font_size = font_surface.get_size()
             font_left = self.width_board + (self.width_panel - font_size[0]) / 2
             font_top = self.margin_panel + num * (self.mode_size[1] + self.margin_panel) + (self.mode_size[1] - font_size[1]) / 2
             self.screen.blit(font_surface, (font_left,font_top))
 
+        # 버튼 아래에 실행 속도 / 보드 화면 배율 / 경로가 없을 때 실패 표시
+        font_top = self.margin_panel + len(self.modes) * self.mode_interval
+        labels = [(self.speed_label(), COLOR_WHITE), (self.view.label(), COLOR_WHITE)]
+        if self.status == 'complete' and self.no_path:
+            labels.append(('No path', COLOR_RED))
+        if self.status == 'replay':
+            labels.append((self.replay_label(), COLOR_ORANGE))
+        for text, color in labels:
+            font_surface = self.fonts[20].render(text, True, color)
+            font_left = self.width_board + (self.width_panel - font_surface.get_width()) / 2
+            self.screen.blit(font_surface, (font_left, font_top))
+            font_top += font_surface.get_height() + self.margin_panel // 2
+
+        # 계측 값 (최근 프레임 평균)
+        for text in self.hud_lines:
+            font_surface = self.fonts[15].render(text, True, COLOR_WHITE)
+            self.screen.blit(font_surface, (self.width_board + self.margin_panel, font_top))
+            font_top += font_surface.get_height() + 2
+
+        return panel_rect
+
+    def replay_label(self):
+        return 'step {} / {}'.format(self.replay_pos, len(self.recording))
+
+    def hud_text(self):
+        '''
+        패널에 표시할 계측 값: 초당 단계 수, 프레임 / 탐색 / 그리기 시간, 열린 목록 크기 / 버린 항목 수
+        '''
+        summary = self.instrument.summary()
+        return ['{:.0f} steps/s'.format(summary['steps_per_s']),
+                'frame {:.1f} ms'.format(summary['frame_ms']),
+                'search {:.1f} ms'.format(summary['search_ms']),
+                'draw {:.1f} ms'.format(summary['draw_ms']),
+                'open {} / stale {}'.format(summary['open'], summary['stale'])]
+
+    def draw(self):
+        '''
+        화면에 띄우기 (지난 프레임 이후 바뀐 부분만)
+        '''
+        dirty_rects = []
+
+        # 시작점 / 끝점 칠하기
+        for cell, cell_type in ((self.start_cell, CELL_START), (self.end_cell, CELL_END)):
+            if cell.type != cell_type:
+                cell.type = cell_type
+                self.dirty_cells.add(cell.idx)
+
+        # 배경 칠하기 (보이는 보드 전체)
+        board_drawn = False
+        if self.redraw_all:
+            self.screen.fill(COLOR_BLACK)
+            self.render_board()
+            board_drawn = True
+            self.dirty_cells.clear()
+            self.overlay_rects.clear()
+            self.panel_key = None
+            self.path_drawn = False
+            self.redraw_all = False
+            dirty_rects.append(self.screen.get_rect())
+
+        # 지난 프레임의 디버그 글자 지우기: 아래 보드 / 패널 다시 그림
+        for rect in self.overlay_rects:
+            if rect.colliderect(self.view.rect):
+                self.render_board(rect)
+                board_drawn = True
+            if rect.right > self.width_board:
+                self.panel_key = None
+            dirty_rects.append(rect)
+        self.overlay_rects.clear()
+
+        # 바뀐 셀이 걸친 영역만 칠하기 (비용은 영역의 화면 픽셀 수만큼)
+        if self.dirty_cells:
+            for rect in self.view.cells_rects(self.dirty_cells):
+                dirty_rects.append(self.render_board(rect))
+            board_drawn = True
+            self.dirty_cells.clear()
+
+        # 최단 경로선 칠하기 (처음이거나 아래 보드를 다시 칠했을 때, 다시 보기는 마지막 단계에서)
+        if self.status == 'complete' or self.status == 'replay' and self.replay_pos == len(self.recording):
+            if self.path and len(self.path) > 1 and (board_drawn or not self.path_drawn):
+                points = [self.view.cell_center(x_idx, y_idx) for x_idx, y_idx in self.path]
+                self.screen.set_clip(self.view.rect)  # 보드 밖(패널)으로 나간 부분은 그리지 않음
+                dirty_rects.append(pygame.draw.lines(self.screen, COLOR_YELLOW, False, points, 2).clip(self.view.rect))
+                self.screen.set_clip(None)
+                self.path_drawn = True
+
+        # 패널은 모드 / 실패 표시가 바뀔 때만
+        now = time.perf_counter()
+        if now - self.hud_time >= HUD_INTERVAL:
+            self.hud_lines = self.hud_text()
+            self.hud_time = now
+        panel_key = (self.mode, self.speed_label(), self.view.label(), self.status == 'complete' and self.no_path,
+                     self.status == 'replay' and self.replay_label(), tuple(self.hud_lines))
+        if panel_key != self.panel_key:
+            dirty_rects.append(self.draw_panel())
+            self.panel_key = panel_key
+
         # 디버그 변수 텍스트 설정
-        if self.status in ('pause', 'complete'):
-            font = pygame.font.Font(PATH_FONT, 15)
-            for num, debug_v in enumerate(self.debug_list): 
-            # while self.debug_list:
-            #     (debug_x, debug_y), debug_name, debug_value = self.debug_list.pop()
-                (debug_x, debug_y), debug_name, debug_value = debug_v
-                font_surface = font.render('{}: {}'.format(debug_name, debug_value), True, COLOR_BLACK)
-                font_size = font_surface.get_size()
+        if self.status in ('pause', 'complete', 'replay'):
+            debug_key = tuple(self.debug_list)
+            if debug_key != self.debug_key:  # 내용이 바뀔 때만 렌더링
+                font = self.fonts[15]
+                self.debug_surfaces = [font.render('{}: {}'.format(debug_name, debug_value), True, COLOR_BLACK)
+                                       for _, debug_name, debug_value in self.debug_list]
+                self.debug_key = debug_key
+            for num, (debug_v, font_surface) in enumerate(zip(self.debug_list, self.debug_surfaces)):
+                (debug_x, debug_y), _, _ = debug_v
                 font_left = debug_x + 15
                 font_top = debug_y + num * 15
-                self.screen.blit(font_surface, (font_left,font_top))
-        
-        # 화면에 띄우기
-        pygame.display.flip()
-        # pygame.display.update()
+                rect = self.screen.blit(font_surface, (font_left,font_top))
+                self.overlay_rects.append(rect)
+                dirty_rects.append(rect)
+
+        # 화면에 띄우기 (바뀐 영역만)
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
 
     def exec(self):
         '''
         시뮬레이터 실행
         '''
         while True:
-            self.handle_event()  # 마우스 / 키보드 입력 받기
-
-            if self.status == 'ready':  # 알고리즘 실행 전 설정
-                self.ready()
-            if self.status == 'run':  # 알고리즘 실행
-                self.run()
-            if self.status == 'complete':  # 알고리즘 실행 후 처리
-                self.complete()
-
-            self.draw()  # 화면에 띄우기
+            with self.instrument.phase('events'):
+                self.handle_event()  # 마우스 / 키보드 입력 받기
+
+            with self.instrument.phase('search'):
+                if self.status == 'ready':  # 알고리즘 실행 전 설정
+                    self.ready()
+                if self.status == 'run':  # 알고리즘 실행
+                    self.step()
+                if self.status == 'complete':  # 알고리즘 실행 후 처리
+                    self.complete()
+                if self.status == 'replay':  # 탐색 기록 다시 보기
+                    self.replay()
+
+            # 끝까지 실행 모드는 실행 중 화면을 그리지 않고 바로 다음 구간 실행
+            if self.finish and self.status == 'run':
+                continue
+
+            with self.instrument.phase('draw'):
+                self.draw()  # 화면에 띄우기
 
             self.clock.tick(FPS)  # FPS 일정하게 조절
+            self.instrument.end_frame()
 
 
 if __name__ == '__main__':
-    simulator = Simulator()
+    simulator = Simulator(sys.argv[1] if len(sys.argv) > 1 else None)  # python3 simulator.py map.grid
 
     simulator.exec()  # 시뮬레이터 실행
@@ -0,0 +1,220 @@
+'''
+보드 화면: 보드의 보이는 부분만 셀 종류 배열에서 바로 칠하는 확대 / 이동 가능한 뷰
+
+보이는 셀 종류를 색 배열로 바꿔 셀 하나를 픽셀 하나로 pygame.surfarray 로 쓰고 확대해서 붙이므로,
+한 프레임의 비용은 보드 크기가 아니라 화면 픽셀 수만큼 (축소하면 픽셀 하나에 셀 하나만 골라 칠함)
+
+    view = Viewport(grid, pygame.Rect(0, 0, 900, 900))
+    view.render(screen)                      # 보이는 보드 전체
+    for rect in view.cells_rects(changed):   # 바뀐 셀이 걸친 영역만
+        view.render(screen, rect)
+    view.cell_at(x, y)                       # 화면 (x, y) 의 셀 위치, 보드 밖이면 None
+    view.zoom(1, x, y)                       # (x, y) 를 중심으로 한 단계 확대
+
+numpy 가 없으면 보이는 셀마다 fill 로 칠함 (느리지만 비용은 똑같이 화면 크기만큼)
+'''
+import pygame
+
+from constants import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Viewport(object):
+    def __init__(self, grid, rect, max_size=CELL_SIZE):
+        self.grid = grid
+        self.rect = pygame.Rect(rect)  # 보드를 그리는 화면 영역
+        self.level = 0  # ZOOM_LEVELS 번호
+        self.scale = self.stride = 1  # 셀 하나의 픽셀 수 / 픽셀 하나의 셀 수 (둘 중 하나는 1)
+        self.offset_x = self.offset_y = 0  # 화면 왼쪽 위가 가리키는 보드 픽셀 위치 (지금 배율에서)
+        self.palette = None  # 셀 종류별 화면 색 값, 처음 그릴 때 만듦
+        self.fit(max_size)
+
+    def set_level(self, level):
+        self.level = min(max(level, 0), len(ZOOM_LEVELS) - 1)
+        size = ZOOM_LEVELS[self.level]
+        self.scale, self.stride = (int(size), 1) if size >= 1 else (1, round(1 / size))
+
+    def fit(self, max_size=CELL_SIZE):
+        '''
+        보드 전체가 화면에 들어오는 가장 큰 배율 (셀 하나가 max_size 픽셀 이하) 로 가운데 맞춤
+        '''
+        level = 0
+        for num, size in enumerate(ZOOM_LEVELS):
+            if size <= max_size and self.grid.width * size <= self.rect.width and self.grid.height * size <= self.rect.height:
+                level = num
+        self.set_level(level)
+        self.clamp()
+
+    def board_size(self):
+        # 지금 배율에서 보드 전체의 픽셀 크기
+        return (-(-self.grid.width * self.scale // self.stride),
+                -(-self.grid.height * self.scale // self.stride))
+
+    def clamp(self):
+        '''
+        보드가 화면보다 작으면 가운데, 크면 화면 밖으로 나가지 않게 이동 위치 제한
+        '''
+        board_width, board_height = self.board_size()
+        if board_width <= self.rect.width:
+            self.offset_x = -((self.rect.width - board_width) // 2)
+        else:
+            self.offset_x = min(max(self.offset_x, 0), board_width - self.rect.width)
+        if board_height <= self.rect.height:
+            self.offset_y = -((self.rect.height - board_height) // 2)
+        else:
+            self.offset_y = min(max(self.offset_y, 0), board_height - self.rect.height)
+
+    def pan(self, dx, dy):
+        '''
+        화면을 (dx, dy) 픽셀만큼 끌기 (보드는 같은 방향으로 움직임)
+        '''
+        self.offset_x -= dx
+        self.offset_y -= dy
+        self.clamp()
+
+    def zoom(self, steps, x, y):
+        '''
+        화면 (x, y) 아래의 보드 위치를 그대로 두고 steps 단계 확대 (음수면 축소)
+        '''
+        board_x = (x - self.rect.left + self.offset_x) * self.stride / self.scale
+        board_y = (y - self.rect.top + self.offset_y) * self.stride / self.scale
+        self.set_level(self.level + steps)
+        self.offset_x = int(board_x * self.scale / self.stride) - (x - self.rect.left)
+        self.offset_y = int(board_y * self.scale / self.stride) - (y - self.rect.top)
+        self.clamp()
+
+    def label(self):
+        return '{} px/cell'.format(self.scale) if self.stride == 1 else '1/{} px/cell'.format(self.stride)
+
+    def cell_at(self, x, y):
+        '''
+        화면 (x, y) 의 셀 위치 (보드 밖이면 None, 축소했으면 그 픽셀이 나타내는 셀들의 왼쪽 위)
+        '''
+        cell_x = (x - self.rect.left + self.offset_x) // self.scale * self.stride
+        cell_y = (y - self.rect.top + self.offset_y) // self.scale * self.stride
+        if self.rect.collidepoint(x, y) and 0 <= cell_x < self.grid.width and 0 <= cell_y < self.grid.height:
+            return cell_x, cell_y
+        return None
+
+    def cell_center(self, x, y):
+        '''
+        셀 (x, y) 가운데의 화면 위치
+        '''
+        return (self.rect.left + (2 * x + 1) * self.scale // (2 * self.stride) - self.offset_x,
+                self.rect.top + (2 * y + 1) * self.scale // (2 * self.stride) - self.offset_y)
+
+    def cells_rects(self, cells):
+        '''
+        셀 인덱스들이 걸친 화면 영역 리스트: 화면을 DIRTY_TILE 픽셀 칸으로 나눠 칸마다 그 안의 셀들을 덮는 영역 하나
+        (화면 밖은 버림, 셀이 작으면 덧칠한 표시까지 덮게 넓힘)
+        셀이 DIRTY_CELLS 개보다 많으면 나누지 않고 보드 화면 전체 하나
+        '''
+        if len(cells) > DIRTY_CELLS:
+            return [pygame.Rect(self.rect)]
+        width, scale, stride = self.grid.width, self.scale, self.stride
+        tiles = {}  # (칸 x, 칸 y) - [최소 x, 최소 y, 최대 x, 최대 y] (셀 위치)
+        for idx in cells:
+            y, x = divmod(idx, width)
+            key = (x * scale // stride - self.offset_x) // DIRTY_TILE, (y * scale // stride - self.offset_y) // DIRTY_TILE
+            bounds = tiles.get(key)
+            if bounds is None:
+                tiles[key] = [x, y, x, y]
+            else:
+                bounds[0], bounds[1] = min(bounds[0], x), min(bounds[1], y)
+                bounds[2], bounds[3] = max(bounds[2], x), max(bounds[3], y)
+
+        rects = []
+        for x0, y0, x1, y1 in tiles.values():
+            left = x0 * scale // stride - self.offset_x
+            top = y0 * scale // stride - self.offset_y
+            right = (x1 + 1) * scale // stride - self.offset_x + 1
+            bottom = (y1 + 1) * scale // stride - self.offset_y + 1
+            rect = pygame.Rect(self.rect.left + left, self.rect.top + top, right - left, bottom - top)
+            if scale < MARK_SIZE:
+                rect.inflate_ip(MARK_SIZE, MARK_SIZE)
+            rect = rect.clip(self.rect)
+            if rect:
+                rects.append(rect)
+        return rects
+
+    def visible(self, area):
+        '''
+        화면 영역 area 에 걸친 셀 범위 (x0, y0, x1, y1), 축소했으면 stride 배수로 맞춤
+        '''
+        scale, stride = self.scale, self.stride
+        x0 = max((area.left - self.rect.left + self.offset_x) // scale * stride, 0)
+        y0 = max((area.top - self.rect.top + self.offset_y) // scale * stride, 0)
+        x1 = min((area.right - self.rect.left + self.offset_x + scale - 1) // scale * stride, self.grid.width)
+        y1 = min((area.bottom - self.rect.top + self.offset_y + scale - 1) // scale * stride, self.grid.height)
+        return x0, y0, x1, y1
+
+    def render(self, surface, area=None, levels=None, level_colors=None, marks=()):
+        '''
+        화면 영역 area (기본: 보드 화면 전체) 를 셀 종류 색으로 칠하고 칠한 영역 반환
+        levels 를 주면 (셀마다 0 ~ len(level_colors) - 1, 칠하지 않을 셀은 -1) 벽 / 시작점 / 끝점이 아닌 셀은 그 색
+        marks 의 (셀 위치, 색) 은 셀이 MARK_SIZE 픽셀보다 작을 때 MARK_SIZE 크기로 덧칠 (시작점 / 끝점)
+        '''
+        area = self.rect.clip(area if area is not None else self.rect)
+        if not area:
+            return area
+        if self.palette is None:
+            self.palette = [surface.map_rgb(color) for color in TYPE_COLORS]
+        level_palette = [surface.map_rgb(color) for color in level_colors] if levels is not None else None
+
+        surface.set_clip(area)
+        surface.fill(COLOR_BLACK, area)  # 보드 밖 / 칸 경계선
+        x0, y0, x1, y1 = self.visible(area)
+        if x0 < x1 and y0 < y1:
+            left = self.rect.left + x0 * self.scale // self.stride - self.offset_x
+            top = self.rect.top + y0 * self.scale // self.stride - self.offset_y
+            if np is not None:
+                self.blit_cells(surface, left, top, x0, y0, x1, y1, levels, level_palette)
+            else:
+                self.fill_cells(surface, left, top, x0, y0, x1, y1, levels, level_palette)
+        if self.scale < MARK_SIZE:
+            for pos, color in marks:
+                rect = pygame.Rect(0, 0, MARK_SIZE, MARK_SIZE)
+                rect.center = self.cell_center(*pos)
+                surface.fill(color, rect.clip(area))  # fill 은 음수 위치를 자르지 않고 0 으로 옮김
+        surface.set_clip(None)
+        return area
+
+    def blit_cells(self, surface, left, top, x0, y0, x1, y1, levels, level_palette):
+        # 셀 하나를 픽셀 하나로 쓴 작은 화면을 만든 뒤 확대해서 붙임
+        grid, stride = self.grid, self.stride
+        types = np.frombuffer(grid.types, dtype=np.uint8).reshape(grid.height, grid.width)[y0:y1:stride, x0:x1:stride]
+        colors = np.array(self.palette, dtype=np.uint32)[types]
+        if levels is not None:
+            levels = np.asarray(levels).reshape(grid.height, grid.width)[y0:y1:stride, x0:x1:stride]
+            heat = (levels >= 0) & (types != CELL_WALL) & (types != CELL_START) & (types != CELL_END)
+            colors[heat] = np.array(level_palette, dtype=np.uint32)[levels[heat]]
+
+        rows, cols = types.shape
+        cells = pygame.Surface((cols, rows), 0, surface)
+        pygame.surfarray.blit_array(cells, colors.T)  # surfarray 는 (x, y) 순서
+        if self.scale > 1:
+            cells = pygame.transform.scale(cells, (cols * self.scale, rows * self.scale))
+            if self.scale >= GRID_LINE_SIZE:  # 셀 오른쪽 / 아래 1 픽셀은 칸 경계선
+                for num in range(1, cols + 1):
+                    cells.fill(COLOR_BLACK, (num * self.scale - 1, 0, 1, rows * self.scale))
+                for num in range(1, rows + 1):
+                    cells.fill(COLOR_BLACK, (0, num * self.scale - 1, cols * self.scale, 1))
+        surface.blit(cells, (left, top))
+
+    def fill_cells(self, surface, left, top, x0, y0, x1, y1, levels, level_palette):
+        # numpy 없이 보이는 셀마다 칠하기
+        grid, scale, stride = self.grid, self.scale, self.stride
+        size = scale - 1 if scale >= GRID_LINE_SIZE else scale
+        area = surface.get_clip()
+        for row, y in enumerate(range(y0, y1, stride)):
+            for col, x in enumerate(range(x0, x1, stride)):
+                idx = y * grid.width + x
+                cell_type = grid.types[idx]
+                color = self.palette[cell_type]
+                if levels is not None and levels[idx] >= 0 and cell_type not in (CELL_WALL, CELL_START, CELL_END):
+                    color = level_palette[levels[idx]]
+                surface.fill(color, pygame.Rect(left + col * scale, top + row * scale, size, size).clip(area))